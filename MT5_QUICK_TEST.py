@@ -10,6 +10,7 @@ Usage:
 """
 
 import sys
+import time
 
 try:
     import MetaTrader5 as mt5
@@ -18,6 +19,81 @@ except ImportError:
     print("   Install with: pip install MetaTrader5")
     sys.exit(1)
 
+# Every mt5 call is an IPC round-trip to the terminal, so lookups are cached:
+# ticks for a short TTL, symbol specs for the session (until re-selected).
+TICK_TTL = 0.05  # seconds
+_tick_cache = {}  # symbol -> (expires, tick)
+_info_cache = {}  # symbol -> symbol_info
+
+SYMBOLS_WATCH = ("EURUSD", "GBPUSD", "USDJPY", "XAUUSD")
+WATCH_GROUP = ",".join(SYMBOLS_WATCH)
+
+PRICE_HEADER = (
+    "LIVE PRICES:\n"
+    "   +----------+------------+------------+---------+\n"
+    "   | Symbol   | Bid        | Ask        | Spread  |\n"
+    "   +----------+------------+------------+---------+\n"
+)
+PRICE_FOOTER = "   +----------+------------+------------+---------+\n\n"
+
+POSITIONS_HEADER = (
+    "   +----------+------+--------+------------+-------------+\n"
+    "   | Symbol   | Type | Volume | Profit     | Ticket      |\n"
+    "   +----------+------+--------+------------+-------------+\n"
+)
+POSITIONS_FOOTER = "   +----------+------+--------+------------+-------------+\n\n"
+
+# Price difference -> pips
+SPREAD_MULT = {"EURUSD": 10000, "GBPUSD": 10000, "USDJPY": 100, "XAUUSD": 10}
+
+def spread_multiplier(symbol):
+    """Pip multiplier; symbols outside the table derive it from their digits once"""
+    mult = SPREAD_MULT.get(symbol)
+    if mult is None:
+        info = get_symbol_info(symbol)
+        mult = 10 ** (info.digits - 1) if info is not None else 10000
+        SPREAD_MULT[symbol] = mult
+    return mult
+
+def get_tick(symbol):
+    """symbol_info_tick with a short TTL cache"""
+    now = time.monotonic()
+    cached = _tick_cache.get(symbol)
+    if cached and cached[0] > now:
+        return cached[1]
+    tick = mt5.symbol_info_tick(symbol)
+    if tick is not None:
+        _tick_cache[symbol] = (now + TICK_TTL, tick)
+    return tick
+
+def get_symbol_info(symbol):
+    """symbol_info, cached for the session"""
+    info = _info_cache.get(symbol)
+    if info is None:
+        info = mt5.symbol_info(symbol)
+        if info is not None:
+            _info_cache[symbol] = info
+    return info
+
+def select_symbol(symbol):
+    """symbol_select that invalidates the cached symbol_info"""
+    _info_cache.pop(symbol, None)
+    return mt5.symbol_select(symbol, True)
+
+def get_watch_quotes():
+    """
+    Bid/ask for the whole watchlist in one symbols_get call.
+    SymbolInfo already carries bid/ask, so no per-symbol tick request is
+    needed; the specs are stored in the symbol_info cache on the way.
+    """
+    infos = mt5.symbols_get(group=WATCH_GROUP) or ()
+    quotes = {}
+    for info in infos:
+        _info_cache[info.name] = info
+        if info.visible and info.bid > 0:
+            quotes[info.name] = info
+    return quotes
+
 def print_header():
     print("""
     +=============================================+
@@ -72,27 +148,20 @@ ACCOUNT INFO:
     return account.trade_allowed
 
 def show_prices():
-    symbols = ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD"]
-    print("LIVE PRICES:")
-    print("   +----------+------------+------------+---------+")
-    print("   | Symbol   | Bid        | Ask        | Spread  |")
-    print("   +----------+------------+------------+---------+")
-    
-    for symbol in symbols:
-        tick = mt5.symbol_info_tick(symbol)
+    quotes = get_watch_quotes()
+    
+    # The whole table is built first and written in one call
+    lines = [PRICE_HEADER]
+    for symbol in SYMBOLS_WATCH:
+        # Hidden or not-yet-quoted symbols fall back to a direct tick lookup
+        tick = quotes.get(symbol) or get_tick(symbol)
         if tick:
-            if "JPY" in symbol:
-                spread = (tick.ask - tick.bid) * 100
-            elif "XAU" in symbol:
-                spread = (tick.ask - tick.bid) * 10
-            else:
-                spread = (tick.ask - tick.bid) * 10000
-            print(f"   | {symbol:<8} | {tick.bid:>10.5f} | {tick.ask:>10.5f} | {spread:>6.1f}  |")
+            spread = (tick.ask - tick.bid) * spread_multiplier(symbol)
+            lines.append(f"   | {symbol:<8} | {tick.bid:>10.5f} | {tick.ask:>10.5f} | {spread:>6.1f}  |\n")
         else:
-            print(f"   | {symbol:<8} | {'N/A':>10} | {'N/A':>10} | {'N/A':>6}  |")
-    
-    print("   +----------+------------+------------+---------+")
-    print()
+            lines.append(f"   | {symbol:<8} | {'N/A':>10} | {'N/A':>10} | {'N/A':>6}  |\n")
+    lines.append(PRICE_FOOTER)
+    sys.stdout.writelines(lines)
 
 def show_positions():
     positions = mt5.positions_get()
@@ -100,17 +169,12 @@ def show_positions():
         print("OPEN POSITIONS: None")
         return
     
-    print(f"OPEN POSITIONS: {len(positions)}")
-    print("   +----------+------+--------+------------+-------------+")
-    print("   | Symbol   | Type | Volume | Profit     | Ticket      |")
-    print("   +----------+------+--------+------------+-------------+")
-    
+    lines = [f"OPEN POSITIONS: {len(positions)}\n", POSITIONS_HEADER]
     for pos in positions:
         pos_type = "BUY" if pos.type == 0 else "SELL"
-        print(f"   | {pos.symbol:<8} | {pos_type:<4} | {pos.volume:>6.2f} | {pos.profit:>+10.2f} | {pos.ticket:<11} |")
-    
-    print("   +----------+------+--------+------------+-------------+")
-    print()
+        lines.append(f"   | {pos.symbol:<8} | {pos_type:<4} | {pos.volume:>6.2f} | {pos.profit:>+10.2f} | {pos.ticket:<11} |\n")
+    lines.append(POSITIONS_FOOTER)
+    sys.stdout.writelines(lines)
 
 def execute_demo_trade():
     print("\nDEMO TRADE")
@@ -133,24 +197,28 @@ def execute_demo_trade():
         print("\n   [AUTO-MODE] Executing trade...")
     
     symbol = "EURUSD"
-    symbol_info = mt5.symbol_info(symbol)
+    symbol_info = get_symbol_info(symbol)
     
     if symbol_info is None:
         print(f"   ERROR: Symbol {symbol} not found!")
         return
     
     if not symbol_info.visible:
-        if not mt5.symbol_select(symbol, True):
+        if not select_symbol(symbol):
             print(f"   ERROR: Cannot select {symbol}!")
             return
     
-    tick = mt5.symbol_info_tick(symbol)
+    tick = get_tick(symbol)
     if tick is None:
         print(f"   ERROR: Cannot get price for {symbol}!")
         return
     
     price = tick.ask
-    point = symbol_info.point
+    
+    # Work on the integer point grid: an integer divided by the exact
+    # power-of-ten scale lands on the nearest double, so no round() needed
+    scale = round(1 / symbol_info.point)
+    price_points = round(price * scale)
     
     # Order request
     request = {
@@ -159,8 +227,8 @@ def execute_demo_trade():
         "volume": 0.01,
         "type": mt5.ORDER_TYPE_BUY,
         "price": price,
-        "sl": round(price - 50 * point, 5),  # 50 pips SL
-        "tp": round(price + 100 * point, 5), # 100 pips TP
+        "sl": (price_points - 50) / scale,   # 50 pips SL
+        "tp": (price_points + 100) / scale,  # 100 pips TP
         "deviation": 20,
         "magic": 123456789,
         "comment": "K.I.T. Test Trade",
@@ -6,20 +6,29 @@ Now with Machine Learning predictions!
 
 Features:
 - Real market data from CoinGecko
-- ML-based price prediction (sklearn ensemble)
+- ML-based price prediction (LightGBM, or sklearn ensemble fallback)
 - Technical indicator analysis
 - Risk management
 - Position tracking
 """
 
+import importlib.util
 import json
+import math
+from bisect import bisect_left, bisect_right
 import os
 import sys
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import random
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Fix Windows console encoding
 if sys.platform == "win32":
@@ -28,21 +37,34 @@ if sys.platform == "win32":
     except:
         pass
 
-# ML imports
-try:
-    from sklearn.preprocessing import MinMaxScaler
-    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-    ML_AVAILABLE = True
-    print("[ML] scikit-learn loaded - ML predictions enabled")
-except ImportError:
-    ML_AVAILABLE = False
+# ML capabilities - only probed here; the heavy sklearn / LightGBM / ONNX
+# imports happen on first use inside MLPredictor so that runs which never
+# train (e.g. --report) do not pay for loading them
+ML_AVAILABLE = importlib.util.find_spec("sklearn") is not None
+if ML_AVAILABLE:
+    print("[ML] scikit-learn available - ML predictions enabled")
+else:
     print("[ML] scikit-learn not available - using rule-based only")
 
+# LightGBM: histogram-based boosted trees with OpenMP, preferred when installed
+LGBM_AVAILABLE = ML_AVAILABLE and importlib.util.find_spec("lightgbm") is not None
+if LGBM_AVAILABLE:
+    print("[ML] LightGBM available - using gradient-boosted trees")
+
+# ONNX Runtime: compiled single-row inference for the sklearn ensemble
+ONNX_AVAILABLE = (ML_AVAILABLE
+                  and importlib.util.find_spec("skl2onnx") is not None
+                  and importlib.util.find_spec("onnxruntime") is not None)
+
+# orjson: much faster state (de)serialization, stdlib json as fallback
 try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    PANDAS_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
+if not PANDAS_AVAILABLE:
     print("[WARN] pandas not available - limited ML features")
 
 # Paths
@@ -52,6 +74,21 @@ STATE_FILE = BASE_DIR / "state.json"
 LOG_DIR = BASE_DIR / "logs"
 ML_CACHE_DIR = BASE_DIR / "ml_cache"
 
+# Shared HTTP session - keeps CoinGecko connections alive between polls
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]),
+))
+HTTP_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Persistent worker pool for market fetches (kept below the session pool size)
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kit-fetch")
+
+# Length of the vector produced by MLPredictor.calculate_features
+N_FEATURES = 11
+
 # Ensure directories exist
 LOG_DIR.mkdir(exist_ok=True)
 ML_CACHE_DIR.mkdir(exist_ok=True)
@@ -64,117 +101,313 @@ ML_CACHE_DIR.mkdir(exist_ok=True)
 class MLPredictor:
     """
     Machine Learning predictor for K.I.T.
-    Uses sklearn ensemble (Random Forest + Gradient Boosting)
+    Uses a LightGBM classifier when installed, otherwise an sklearn
+    ensemble (Random Forest + Gradient Boosting)
     """
     
     def __init__(self):
         self.models = {}
-        self.scaler = MinMaxScaler() if ML_AVAILABLE else None
-        self.price_history = {}  # symbol -> list of prices
+        self.sessions = {}  # symbol -> {model name: onnxruntime session}
+        self._scaler = None
+        self.price_history = {}  # symbol -> ring buffers of close/change/ts
         self.history_limit = 200
+        self.trained_at = {}  # symbol -> sample count at last (re)train
+        self.retrain_every = 25  # new samples before the model is refreshed
+        self.rf_warm_step = 5  # trees added per warm-start retrain
+        self.rf_max_trees = 100  # forest is rebuilt from scratch beyond this
         
+    @property
+    def scaler(self):
+        """MinMaxScaler, created on first access"""
+        if self._scaler is None and ML_AVAILABLE:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler()
+        return self._scaler
+    
     def add_price(self, symbol: str, price: float, change: float):
-        """Add price to history for ML training"""
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-        
-        self.price_history[symbol].append({
-            'price': price,
-            'change': change,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-        # Keep limited history
-        if len(self.price_history[symbol]) > self.history_limit:
-            self.price_history[symbol] = self.price_history[symbol][-self.history_limit:]
-    
-    def calculate_features(self, prices: list) -> np.ndarray:
-        """Calculate technical indicators from price history"""
-        if len(prices) < 20:
-            return None
+        """Add price to history and roll the streaming indicator sums"""
+        limit = self.history_limit
+        hist = self.price_history.get(symbol)
+        if hist is None:
+            hist = self.price_history[symbol] = {
+                'close': np.empty(limit, dtype=np.float64),
+                'change': np.empty(limit, dtype=np.float64),
+                'ts': np.empty(limit, dtype=np.int64),  # epoch nanoseconds
+                'n': 0,
+                'head': 0,
+                'count': 0,  # total samples ever added
+                # Running window sums for the O(1) feature path
+                's5': 0.0, 's10': 0.0, 's20': 0.0,
+                'gain': 0.0, 'loss': 0.0,  # last 14 diffs (RSI)
+                'rsum': 0.0, 'rsq': 0.0,   # last 19 returns (volatility)
+                'features': np.empty(N_FEATURES, dtype=np.float32),
+            }
         
-        close = np.array([p['price'] for p in prices])
-        changes = np.array([p['change'] for p in prices])
+        close = hist['close']
+        n, head = hist['n'], hist['head']
         
-        features = []
+        # Values leaving each window are read before the slot is overwritten;
+        # close[(head - k) % limit] is the k-th most recent close
+        if n:
+            prev = close[(head - 1) % limit]
+            delta = price - prev
+            ret = delta / prev
+            hist['gain'] += max(delta, 0.0)
+            hist['loss'] += max(-delta, 0.0)
+            hist['rsum'] += ret
+            hist['rsq'] += ret * ret
+        if n >= 15:
+            old_delta = close[(head - 14) % limit] - close[(head - 15) % limit]
+            hist['gain'] -= max(old_delta, 0.0)
+            hist['loss'] -= max(-old_delta, 0.0)
+        if n >= 20:
+            old_prev = close[(head - 20) % limit]
+            old_ret = (close[(head - 19) % limit] - old_prev) / old_prev
+            hist['rsum'] -= old_ret
+            hist['rsq'] -= old_ret * old_ret
+        for w, key in ((5, 's5'), (10, 's10'), (20, 's20')):
+            hist[key] += price
+            if n >= w:
+                hist[key] -= close[(head - w) % limit]
         
-        # Price momentum
-        features.append(close[-1] / close[-5] - 1 if len(close) >= 5 else 0)  # 5-period momentum
-        features.append(close[-1] / close[-10] - 1 if len(close) >= 10 else 0)  # 10-period momentum
-        features.append(close[-1] / close[-20] - 1 if len(close) >= 20 else 0)  # 20-period momentum
+        # Overwrite the oldest slot once the ring is full
+        close[head] = price
+        hist['change'][head] = change
+        hist['ts'][head] = time.time_ns()
+        hist['head'] = (head + 1) % limit
+        hist['count'] += 1
+        if n < limit:
+            hist['n'] = n + 1
         
-        # Moving averages ratio
-        sma5 = np.mean(close[-5:]) if len(close) >= 5 else close[-1]
-        sma10 = np.mean(close[-10:]) if len(close) >= 10 else close[-1]
-        sma20 = np.mean(close[-20:]) if len(close) >= 20 else close[-1]
+        # Re-derive the sums on every wrap so float drift cannot accumulate
+        if hist['head'] == 0:
+            self._resync_sums(hist)
+    
+    def _resync_sums(self, hist: dict):
+        """Recompute the running window sums exactly from the ring"""
+        close = self.get_history_arrays(hist)[0]
+        d = np.diff(close[-15:])
+        window = close[-20:]
+        returns = np.diff(window) / window[:-1]
+        hist['s5'] = close[-5:].sum()
+        hist['s10'] = close[-10:].sum()
+        hist['s20'] = close[-20:].sum()
+        hist['gain'] = np.clip(d, 0, None).sum()
+        hist['loss'] = -np.clip(d, None, 0).sum()
+        hist['rsum'] = returns.sum()
+        hist['rsq'] = (returns * returns).sum()
+    
+    def history_length(self, symbol: str) -> int:
+        """Number of samples currently buffered for a symbol"""
+        hist = self.price_history.get(symbol)
+        return hist['n'] if hist else 0
+    
+    def get_history(self, symbol: str) -> tuple:
+        """
+        Return (close, change) arrays in chronological order.
+        Plain slices until the ring wraps; only then is a copy needed.
+        """
+        return self.get_history_arrays(self.price_history[symbol])
+    
+    def get_history_arrays(self, hist: dict) -> tuple:
+        """Chronological (close, change) view of one symbol's ring"""
+        n, head = hist['n'], hist['head']
+        close, change = hist['close'], hist['change']
+        if n < self.history_limit:
+            return close[:n], change[:n]
+        if head == 0:
+            return close, change
+        return (np.concatenate((close[head:], close[:head])),
+                np.concatenate((change[head:], change[:head])))
+    
+    def calculate_features(self, close: np.ndarray, changes: np.ndarray) -> np.ndarray:
+        """Calculate technical indicators for the last sample of close/change"""
+        if len(close) < 20:
+            return None
+        return self.calculate_feature_matrix(close[-20:], changes[-20:])[0]
+    
+    def calculate_feature_matrix(self, close: np.ndarray, changes: np.ndarray) -> np.ndarray:
+        """
+        Feature rows for every sample with a full 20-period window.
+        Row r describes close[r + 19]; all indicators are column reductions
+        over a sliding-window view, so no per-row Python work is done.
+        """
+        W = sliding_window_view(close, 20)
+        last = W[:, -1]
         
-        features.append(close[-1] / sma5 - 1)
-        features.append(close[-1] / sma10 - 1)
-        features.append(close[-1] / sma20 - 1)
-        features.append(sma5 / sma20 - 1)  # MA crossover signal
+        # Moving averages
+        sma5 = W[:, -5:].mean(axis=1)
+        sma10 = W[:, -10:].mean(axis=1)
+        sma20 = W.mean(axis=1)
         
-        # RSI approximation
-        gains = np.maximum(np.diff(close[-15:]), 0)
-        losses = np.abs(np.minimum(np.diff(close[-15:]), 0))
-        avg_gain = np.mean(gains) if len(gains) > 0 else 0.001
-        avg_loss = np.mean(losses) if len(losses) > 0 else 0.001
+        # RSI approximation - diffs computed once, split into gains/losses
+        d = np.diff(W[:, -15:], axis=1)
+        avg_gain = np.clip(d, 0, None).mean(axis=1)
+        avg_loss = -np.clip(d, None, 0).mean(axis=1)
         rs = avg_gain / (avg_loss + 1e-10)
         rsi = 100 - (100 / (1 + rs))
-        features.append(rsi / 100)  # Normalized RSI
         
         # Volatility
-        returns = np.diff(close[-20:]) / close[-20:-1]
-        volatility = np.std(returns) if len(returns) > 1 else 0
-        features.append(volatility)
+        returns = np.diff(W, axis=1) / W[:, :-1]
+        
+        return np.column_stack([
+            # Price momentum (5/10/20-period)
+            last / W[:, -5] - 1,
+            last / W[:, -10] - 1,
+            last / W[:, 0] - 1,
+            # Moving averages ratio
+            last / sma5 - 1,
+            last / sma10 - 1,
+            last / sma20 - 1,
+            sma5 / sma20 - 1,  # MA crossover signal
+            rsi / 100,  # Normalized RSI
+            returns.std(axis=1),
+            changes[19:] / 100,  # Recent change
+            # Trend strength (price above/below MAs)
+            ((last > sma5).astype(np.float64) + (last > sma10) + (last > sma20)) / 3,
+        ])
+    
+    def latest_features(self, symbol: str) -> np.ndarray:
+        """
+        Features for the newest sample, built from the running sums in O(1).
+        Matches calculate_features on the full history; the returned array
+        is reused between calls.
+        """
+        hist = self.price_history.get(symbol)
+        if hist is None or hist['n'] < 20:
+            return None
+        
+        limit = self.history_limit
+        close = hist['close']
+        head = hist['head']
+        last = close[(head - 1) % limit]
+        
+        sma5 = hist['s5'] / 5
+        sma10 = hist['s10'] / 10
+        sma20 = hist['s20'] / 20
         
-        # Recent change
-        features.append(changes[-1] / 100 if len(changes) > 0 else 0)
+        rs = (hist['gain'] / 14) / (hist['loss'] / 14 + 1e-10)
+        rsi = 100 - (100 / (1 + rs))
         
-        # Trend strength (price above/below MAs)
-        above_sma5 = 1 if close[-1] > sma5 else 0
-        above_sma10 = 1 if close[-1] > sma10 else 0
-        above_sma20 = 1 if close[-1] > sma20 else 0
-        features.append((above_sma5 + above_sma10 + above_sma20) / 3)
+        mean_ret = hist['rsum'] / 19
+        volatility = math.sqrt(max(hist['rsq'] / 19 - mean_ret * mean_ret, 0.0))
         
-        return np.array(features)
+        out = hist['features']
+        out[0] = last / close[(head - 5) % limit] - 1
+        out[1] = last / close[(head - 10) % limit] - 1
+        out[2] = last / close[(head - 20) % limit] - 1
+        out[3] = last / sma5 - 1
+        out[4] = last / sma10 - 1
+        out[5] = last / sma20 - 1
+        out[6] = sma5 / sma20 - 1
+        out[7] = rsi / 100
+        out[8] = volatility
+        out[9] = hist['change'][(head - 1) % limit] / 100
+        out[10] = (int(last > sma5) + int(last > sma10) + int(last > sma20)) / 3
+        return out
     
     def train_model(self, symbol: str):
         """Train ML model for a symbol"""
         if not ML_AVAILABLE or symbol not in self.price_history:
             return False
         
-        prices = self.price_history[symbol]
-        if len(prices) < 50:  # Need minimum data
+        close, changes = self.get_history(symbol)
+        if len(close) < 50:  # Need minimum data
             return False
         
-        # Prepare training data
-        X, y = [], []
-        for i in range(30, len(prices) - 1):
-            features = self.calculate_features(prices[:i])
-            if features is not None:
-                X.append(features)
-                # Target: next price direction (1 = up, 0 = down)
-                next_change = (prices[i+1]['price'] - prices[i]['price']) / prices[i]['price']
-                y.append(1 if next_change > 0 else 0)
+        # Prepare training data: features from close[:i] (row i - 20 of the
+        # matrix) paired with the direction of close[i] -> close[i+1],
+        # for i in 30 .. n-2
+        n = len(close)
+        # float32 halves the bandwidth; sklearn trees split on float32 anyway
+        X = self.calculate_feature_matrix(close, changes)[10:n - 21].astype(np.float32)
+        # Target: next price direction (1 = up, 0 = down)
+        y = (np.diff(close)[30:] > 0).astype(np.int8)
         
         if len(X) < 20:
             return False
         
-        X = np.array(X)
-        y = np.array(y)
+        from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+        import joblib
         
-        # Train ensemble
-        self.models[symbol] = {
-            'rf': RandomForestRegressor(n_estimators=30, max_depth=5, n_jobs=-1),
-            'gb': GradientBoostingRegressor(n_estimators=30, max_depth=3, learning_rate=0.1)
-        }
+        # LightGBM classifier when available (needs both classes present),
+        # otherwise the sklearn RF + GB regressor ensemble
+        if LGBM_AVAILABLE and y.min() != y.max():
+            from lightgbm import LGBMClassifier
+            self.models[symbol] = {
+                'lgbm': LGBMClassifier(n_estimators=60, num_leaves=15, objective='binary',
+                                       n_jobs=-1, verbose=-1)
+            }
+        else:
+            # Warm start: a retrain only fits rf_warm_step new trees on the
+            # current history and keeps the existing ones, until the forest
+            # reaches rf_max_trees and is rebuilt
+            rf = self.models.get(symbol, {}).get('rf')
+            if rf is not None and rf.n_estimators + self.rf_warm_step <= self.rf_max_trees:
+                rf.n_estimators += self.rf_warm_step
+            else:
+                rf = RandomForestRegressor(n_estimators=30, max_depth=5, n_jobs=-1, warm_start=True)
+            self.models[symbol] = {
+                'rf': rf,
+                'gb': GradientBoostingRegressor(n_estimators=30, max_depth=3, learning_rate=0.1)
+            }
         
         for name, model in self.models[symbol].items():
             model.fit(X, y)
+        self._compile_onnx(symbol)
+        self.trained_at[symbol] = self.price_history[symbol]['count']
+        
+        try:
+            joblib.dump(self.models[symbol], self._model_path(symbol), compress=3)
+        except Exception as e:
+            print(f"  [ML] Could not cache model for {symbol}: {e}")
         
         print(f"  [ML] Trained model for {symbol} with {len(X)} samples")
         return True
     
+    def _model_path(self, symbol: str) -> Path:
+        return ML_CACHE_DIR / f"{symbol.replace('/', '_')}.joblib"
+    
+    def load_model(self, symbol: str) -> bool:
+        """Load a model persisted by a previous run from ml_cache/"""
+        path = self._model_path(symbol)
+        if not ML_AVAILABLE or not path.exists():
+            return False
+        import joblib
+        try:
+            self.models[symbol] = joblib.load(path)
+        except Exception as e:
+            print(f"  [ML] Ignoring unreadable model cache {path.name}: {e}")
+            return False
+        self._compile_onnx(symbol)
+        hist = self.price_history.get(symbol)
+        self.trained_at[symbol] = hist['count'] if hist else 0
+        return True
+    
+    def _compile_onnx(self, symbol: str):
+        """Export the trained sklearn regressors to ONNX Runtime sessions"""
+        self.sessions.pop(symbol, None)
+        if not ONNX_AVAILABLE:
+            return
+        
+        import onnxruntime
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+        
+        initial_type = [('input', FloatTensorType([None, N_FEATURES]))]
+        sessions = {}
+        for name, model in self.models[symbol].items():
+            # LightGBM already predicts natively; only sklearn trees are exported
+            if hasattr(model, 'predict_proba'):
+                continue
+            try:
+                onx = convert_sklearn(model, initial_types=initial_type)
+                sessions[name] = onnxruntime.InferenceSession(
+                    onx.SerializeToString(), providers=['CPUExecutionProvider'])
+            except Exception as e:
+                print(f"  [ML] ONNX export failed for {name}: {e}")
+        self.sessions[symbol] = sessions
+    
     def predict(self, symbol: str) -> tuple:
         """
         Predict price direction for a symbol
@@ -185,26 +418,35 @@ class MLPredictor:
         if not ML_AVAILABLE or symbol not in self.price_history:
             return 'neutral', 50
         
-        prices = self.price_history[symbol]
-        if len(prices) < 20:
+        if self.history_length(symbol) < 20:
             return 'neutral', 50
         
-        # Train if not already trained
-        if symbol not in self.models:
+        # Load from ml_cache/ or train if not already available
+        if symbol not in self.models and not self.load_model(symbol):
             if not self.train_model(symbol):
                 return 'neutral', 50
+        elif self.price_history[symbol]['count'] - self.trained_at.get(symbol, 0) >= self.retrain_every:
+            # Refresh on newer data; on failure keep the current model
+            self.train_model(symbol)
         
         # Calculate features
-        features = self.calculate_features(prices)
+        features = self.latest_features(symbol)
         if features is None:
             return 'neutral', 50
         
-        # Get predictions from ensemble
+        # Get predictions from ensemble (classifiers report P(up) directly)
+        x = features.reshape(1, -1)
+        sessions = self.sessions.get(symbol, {})
         predictions = []
         for name, model in self.models[symbol].items():
             try:
-                pred = model.predict(features.reshape(1, -1))[0]
-                predictions.append(pred)
+                if name in sessions:
+                    pred = sessions[name].run(None, {'input': x})[0][0, 0]
+                elif hasattr(model, 'predict_proba'):
+                    pred = model.predict_proba(x)[0, 1]
+                else:
+                    pred = model.predict(x)[0]
+                predictions.append(float(pred))
             except Exception as e:
                 print(f"  [ML] Prediction error: {e}")
         
@@ -212,7 +454,7 @@ class MLPredictor:
             return 'neutral', 50
         
         # Average prediction
-        avg_pred = np.mean(predictions)
+        avg_pred = sum(predictions) / len(predictions)
         
         # Determine direction and confidence
         if avg_pred > 0.6:
@@ -236,67 +478,270 @@ ml_predictor = MLPredictor() if ML_AVAILABLE else None
 # CORE FUNCTIONS
 # =============================================================================
 
-def load_config():
-    with open(CONFIG_FILE) as f:
+def read_json(path):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
         return json.load(f)
 
+# path -> (st_mtime_ns, parsed data); files are only re-parsed when they change
+_JSON_CACHE = {}
+
+def load_json_cached(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = read_json(path)
+    _JSON_CACHE[path] = (mtime, data)
+    return data
+
+def load_config():
+    return load_json_cached(CONFIG_FILE)
+
 def load_state():
-    with open(STATE_FILE) as f:
-        return json.load(f)
+    return load_json_cached(STATE_FILE)
+
+def position_index(state):
+    """
+    symbol -> open position, kept alongside state["positions"].
+    Built on first use after a load; "_"-prefixed keys are not saved.
+    """
+    index = state.get("_positionIndex")
+    if index is None:
+        index = state["_positionIndex"] = {pos["symbol"]: pos for pos in state["positions"]}
+    return index
+
+# Bounded history kept in state.json; statistics are tracked incrementally
+# and do not depend on the full lists
+MAX_DECISIONS = 500
+MAX_TRADE_HISTORY = 1000
 
-def save_state(state):
-    state["lastUpdate"] = datetime.utcnow().isoformat() + "Z"
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+def save_state(state, now_iso: str = None):
+    state["lastUpdate"] = now_iso or datetime.utcnow().isoformat() + "Z"
+    del state["decisions"][:-MAX_DECISIONS]
+    del state["tradeHistory"][:-MAX_TRADE_HISTORY]
+    
+    # Compact JSON: no indentation, minimal separators
+    persisted = {k: v for k, v in state.items() if not k.startswith("_")}
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(persisted, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(persisted, separators=(",", ":")).encode("utf-8")
+    
+    # One buffered write to a temp file, then an atomic rename: a crash
+    # mid-write can never leave a truncated state.json behind
+    tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    with open(tmp, "wb", buffering=1 << 20) as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_FILE)
+    # The in-memory state now matches the file, so the next load can reuse it
+    _JSON_CACHE[STATE_FILE] = (os.stat(STATE_FILE).st_mtime_ns, state)
+
+# CoinGecko quotes only move every few seconds; serve them from memory for
+# CRYPTO_TTL and refresh stale entries in the background, unless they are
+# too old to use at all
+CRYPTO_TTL = 30.0  # seconds
+CRYPTO_MAX_STALE = 300.0  # seconds
+_PRICE_CACHE = {"fetched": 0.0, "data": None}
+_price_refresh = threading.Lock()
 
 def get_crypto_prices():
+    """Crypto prices from a short-lived cache over CoinGecko"""
+    data = _PRICE_CACHE["data"]
+    age = time.monotonic() - _PRICE_CACHE["fetched"]
+    if data and age < CRYPTO_TTL:
+        return data
+    if data and age < CRYPTO_MAX_STALE:
+        # Stale-while-revalidate: at most one refresh in flight
+        if _price_refresh.acquire(blocking=False):
+            EXECUTOR.submit(_refresh_crypto_prices, True)
+        return data
+    with _price_refresh:
+        return _refresh_crypto_prices()
+
+def _refresh_crypto_prices(release: bool = False):
+    try:
+        prices = fetch_crypto_prices()
+        if prices:
+            _PRICE_CACHE["data"] = prices
+            _PRICE_CACHE["fetched"] = time.monotonic()
+            return prices
+        # Failed refresh: fall back to the cache only within CRYPTO_MAX_STALE
+        if _PRICE_CACHE["data"] and time.monotonic() - _PRICE_CACHE["fetched"] < CRYPTO_MAX_STALE:
+            return _PRICE_CACHE["data"]
+        return {}
+    finally:
+        if release:
+            _price_refresh.release()
+
+# (symbol, CoinGecko id) for every tracked coin
+CRYPTO_MAP = (
+    ("BTC/EUR", "bitcoin"),
+    ("ETH/EUR", "ethereum"),
+    ("SOL/EUR", "solana"),
+    ("BNB/EUR", "binancecoin"),
+    ("XRP/EUR", "ripple"),
+)
+_COINGECKO_PARAMS = {
+    "ids": ",".join(cg_id for _, cg_id in CRYPTO_MAP),
+    "vs_currencies": "eur",
+    "include_24hr_change": "true"
+}
+
+def fetch_crypto_prices():
     """Fetch real crypto prices from CoinGecko"""
     try:
         url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            "ids": "bitcoin,ethereum,solana,binancecoin,ripple",
-            "vs_currencies": "eur",
-            "include_24hr_change": "true"
-        }
-        resp = requests.get(url, params=params, timeout=10)
-        data = resp.json()
+        resp = SESSION.get(url, params=_COINGECKO_PARAMS, timeout=HTTP_TIMEOUT)
+        data = orjson.loads(resp.content) if ORJSON_AVAILABLE else resp.json()
+        # Coins missing from the response are left out instead of quoted at 0
         return {
-            "BTC/EUR": {"price": data.get("bitcoin", {}).get("eur", 0), "change": data.get("bitcoin", {}).get("eur_24h_change", 0)},
-            "ETH/EUR": {"price": data.get("ethereum", {}).get("eur", 0), "change": data.get("ethereum", {}).get("eur_24h_change", 0)},
-            "SOL/EUR": {"price": data.get("solana", {}).get("eur", 0), "change": data.get("solana", {}).get("eur_24h_change", 0)},
-            "BNB/EUR": {"price": data.get("binancecoin", {}).get("eur", 0), "change": data.get("binancecoin", {}).get("eur_24h_change", 0)},
-            "XRP/EUR": {"price": data.get("ripple", {}).get("eur", 0), "change": data.get("ripple", {}).get("eur_24h_change", 0)},
+            symbol: {"price": coin.get("eur", 0), "change": coin.get("eur_24h_change", 0)}
+            for symbol, cg_id in CRYPTO_MAP
+            if (coin := data.get(cg_id))
         }
     except Exception as e:
         print(f"Error fetching crypto prices: {e}")
         return {}
 
+# Simulated forex: fixed base rates with random fluctuation
+FOREX_BASE_RATES = {
+    "EUR/USD": 1.0820,
+    "GBP/USD": 1.2650,
+    "USD/JPY": 149.50,
+    "EUR/GBP": 0.8550,
+    "AUD/USD": 0.6520,
+}
+_FOREX_PAIRS = tuple(FOREX_BASE_RATES)
+_FOREX_BASES = np.array(list(FOREX_BASE_RATES.values()))
+
+# Separate generators for the simulated forex quotes and the market noise,
+# so each stream can be seeded on its own and forex fetches (which run on
+# worker threads, in no fixed order) never shift the noise sequence
+_FOREX_RNG = np.random.default_rng()
+_NOISE_RNG = np.random.default_rng()
+
 def get_forex_prices():
     """Fetch forex prices (using approximate rates with fluctuation)"""
     try:
-        base_rates = {
-            "EUR/USD": 1.0820,
-            "GBP/USD": 1.2650,
-            "USD/JPY": 149.50,
-            "EUR/GBP": 0.8550,
-            "AUD/USD": 0.6520,
+        n = len(_FOREX_PAIRS)
+        rates = np.round(_FOREX_BASES * (1 + _FOREX_RNG.uniform(-0.002, 0.002, size=n)), 5)
+        changes = np.round(_FOREX_RNG.uniform(-0.5, 0.5, size=n), 2)
+        return {
+            pair: {"price": price, "change": change}
+            for pair, price, change in zip(_FOREX_PAIRS, rates.tolist(), changes.tolist())
         }
-        prices = {}
-        for pair, base in base_rates.items():
-            fluctuation = random.uniform(-0.002, 0.002)
-            prices[pair] = {
-                "price": round(base * (1 + fluctuation), 5),
-                "change": round(random.uniform(-0.5, 0.5), 2)
-            }
-        return prices
     except Exception as e:
         print(f"Error fetching forex prices: {e}")
         return {}
 
-def analyze_market(symbol, price_data, state):
+MARKET_FETCHERS = {
+    "crypto": get_crypto_prices,
+    "forex": get_forex_prices,
+}
+
+def submit_markets(markets):
+    """Start fetching several markets on the shared executor; returns futures"""
+    return {market: EXECUTOR.submit(MARKET_FETCHERS[market]) for market in markets}
+
+def fetch_markets(markets):
+    """Fetch several markets concurrently on the shared executor"""
+    futures = submit_markets(markets)
+    return {market: future.result() for market, future in futures.items()}
+
+class MarketBuffer:
+    """
+    Latest prices per market, refreshed by a background daemon thread.
+    Each refresh swaps in a new (timestamp, data) tuple, so readers take a
+    snapshot with a single reference read and never wait on the network.
+    """
+    
+    def __init__(self, markets, interval: float = 15.0, staleness_budget: float = 60.0):
+        self.markets = list(markets)
+        self.interval = interval
+        self.staleness_budget = staleness_budget
+        self._snapshot = (0.0, {})  # (monotonic ts, market -> prices)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def refresh(self) -> dict:
+        """Fetch all markets now and publish the result"""
+        with self._refresh_lock:
+            data = fetch_markets(self.markets)
+            self._snapshot = (time.monotonic(), data)
+        return data
+    
+    def snapshot(self) -> dict:
+        """Current prices; falls back to a synchronous fetch when stale"""
+        ts, data = self._snapshot
+        if time.monotonic() - ts > self.staleness_budget:
+            return self.refresh()
+        return data
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="kit-market-buffer", daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[BUFFER] Refresh failed: {e}")
+            self._stop.wait(self.interval)
+
+# Rule-based score per 24h-change band, split at RULE_THRESHOLDS
+RULE_THRESHOLDS = (-3, -2, -0.5, 0.5, 2, 3)
+RULE_BANDS = (
+    (-12 + 8, ("Strong bearish momentum", "Potential oversold bounce")),
+    (-12, ("Strong bearish momentum",)),
+    (-6, ("Mild bearish",)),
+    (0, ()),
+    (6, ("Mild bullish",)),
+    (12, ("Strong bullish momentum",)),
+    (12 - 8, ("Strong bullish momentum", "Potential overbought pullback")),
+)
+_RULE_EDGES = np.array(RULE_THRESHOLDS, dtype=np.float64)
+
+def rule_bands(changes):
+    """RULE_BANDS index for a whole vector of 24h changes"""
+    return np.where(
+        changes < 0,
+        np.searchsorted(_RULE_EDGES, changes, side="right"),
+        np.searchsorted(_RULE_EDGES, changes, side="left"),
+    )
+
+def analyze_markets(prices, state):
+    """
+    analyze_market over every symbol: rule bands and market noise are
+    computed for all symbols in one vector pass, ML and position
+    management stay per symbol.
+    Returns: symbol -> (action, confidence, reason, ml_prediction)
+    """
+    symbols = list(prices)
+    n = len(symbols)
+    changes = np.fromiter((prices[s].get("change", 0) for s in symbols), np.float64, n)
+    bands = rule_bands(changes).tolist()
+    noise = _NOISE_RNG.integers(-5, 6, size=n).tolist()
+    return {
+        symbol: analyze_market(symbol, prices[symbol], state, band=band, noise=z)
+        for symbol, band, z in zip(symbols, bands, noise)
+    }
+
+def analyze_market(symbol, price_data, state, band=None, noise=None):
     """
     Hybrid analysis: ML predictions + rule-based signals
-    Returns: action (buy/sell/hold), confidence (0-100), reason
+    band/noise are passed in by analyze_markets and drawn here otherwise.
+    Returns: action (buy/sell/hold), confidence (0-100), reason,
+             ml_prediction ((direction, confidence) or None without ML)
     """
     price = price_data.get("price", 0)
     change = price_data.get("change", 0)
@@ -306,11 +751,7 @@ def analyze_market(symbol, price_data, state):
         ml_predictor.add_price(symbol, price, change)
     
     # Check for open position
-    open_position = None
-    for pos in state["positions"]:
-        if pos["symbol"] == symbol:
-            open_position = pos
-            break
+    open_position = position_index(state).get(symbol)
     
     # =========================================================================
     # HYBRID ANALYSIS: ML + Rules
@@ -322,7 +763,7 @@ def analyze_market(symbol, price_data, state):
     ml_confidence = 50
     
     # 1. ML Prediction (if available)
-    if ml_predictor and len(ml_predictor.price_history.get(symbol, [])) >= 20:
+    if ml_predictor and ml_predictor.history_length(symbol) >= 20:
         ml_direction, ml_confidence = ml_predictor.predict(symbol)
         
         if ml_direction == 'up':
@@ -332,31 +773,20 @@ def analyze_market(symbol, price_data, state):
             signals.append(f"ML: Bearish ({ml_confidence}%)")
             score -= (ml_confidence - 50) * 0.5
     
-    # 2. Rule-based signals
-    if change > 2:
-        signals.append("Strong bullish momentum")
-        score += 12
-    elif change > 0.5:
-        signals.append("Mild bullish")
-        score += 6
-    elif change < -2:
-        signals.append("Strong bearish momentum")
-        score -= 12
-    elif change < -0.5:
-        signals.append("Mild bearish")
-        score -= 6
-    
-    # Mean reversion opportunity
-    if change < -3:
-        signals.append("Potential oversold bounce")
-        score += 8
-    elif change > 3:
-        signals.append("Potential overbought pullback")
-        score -= 8
+    # Reused for the trade log, so the predictor runs once per symbol
+    ml_prediction = (ml_direction, ml_confidence) if ml_predictor else None
+    
+    # 2. Rule-based signals (momentum + mean reversion) - one band lookup.
+    # Negative thresholds are exclusive (change < -2), positive ones too
+    # (change > 2), hence bisect_right below zero and bisect_left above.
+    if band is None:
+        band = bisect_right(RULE_THRESHOLDS, change) if change < 0 else bisect_left(RULE_THRESHOLDS, change)
+    delta, band_signals = RULE_BANDS[band]
+    score += delta
+    signals.extend(band_signals)
     
     # Add small market noise
-    market_noise = random.randint(-5, 5)
-    score += market_noise
+    score += int(_NOISE_RNG.integers(-5, 6)) if noise is None else noise
     
     # =========================================================================
     # POSITION MANAGEMENT
@@ -369,29 +799,37 @@ def analyze_market(symbol, price_data, state):
         if open_position["direction"] == "long":
             # Take profit
             if pnl_percent >= 3:
-                return "close", 85, f"Take profit at +{pnl_percent:.1f}%"
+                return "close", 85, f"Take profit at +{pnl_percent:.1f}%", ml_prediction
             # Stop loss
             elif pnl_percent <= -2:
-                return "close", 90, f"Stop loss at {pnl_percent:.1f}%"
+                return "close", 90, f"Stop loss at {pnl_percent:.1f}%", ml_prediction
             # ML says strong down - consider early exit
             elif ml_direction == 'down' and ml_confidence >= 70 and pnl_percent > 0:
-                return "close", 75, f"ML exit signal ({ml_confidence}%) at +{pnl_percent:.1f}%"
+                return "close", 75, f"ML exit signal ({ml_confidence}%) at +{pnl_percent:.1f}%", ml_prediction
             else:
-                return "hold", 60, f"Position running at {pnl_percent:+.1f}%"
+                return "hold", 60, f"Position running at {pnl_percent:+.1f}%", ml_prediction
     else:
         # Look for entry
         if score >= 65:
             confidence = min(int(score), 95)
-            return "buy", confidence, " | ".join(signals) if signals else "Bullish setup"
+            return "buy", confidence, " | ".join(signals) if signals else "Bullish setup", ml_prediction
         elif score <= 35:
             confidence = min(100 - int(score), 95)
-            return "sell", confidence, " | ".join(signals) if signals else "Bearish setup"
+            return "sell", confidence, " | ".join(signals) if signals else "Bearish setup", ml_prediction
     
-    return "hold", 50, "No clear setup"
+    return "hold", 50, "No clear setup", ml_prediction
 
-def execute_paper_trade(state, config, symbol, action, price, confidence, reason):
-    """Execute a paper trade and update state"""
-    now = datetime.utcnow()
+def execute_paper_trade(state, config, symbol, action, price, confidence, reason,
+                        ml_prediction=None, now=None, now_iso=None):
+    """
+    Execute a paper trade and update state.
+    now / now_iso let the caller stamp every trade of a cycle with one
+    timestamp instead of formatting a new one per record.
+    """
+    if now is None:
+        now = datetime.utcnow()
+    if now_iso is None:
+        now_iso = now.isoformat() + "Z"
     capital = state["portfolio"]["currentCapital"]
     
     if action == "buy":
@@ -407,7 +845,7 @@ def execute_paper_trade(state, config, symbol, action, price, confidence, reason
             "direction": "long",
             "entryPrice": price,
             "quantity": quantity,
-            "entryTime": now.isoformat() + "Z",
+            "entryTime": now_iso,
             "stopLoss": price * (1 - config["riskManagement"]["defaultStopLossPercent"] / 100),
             "takeProfit": price * (1 + config["riskManagement"]["defaultTakeProfitPercent"] / 100),
             "confidence": confidence,
@@ -416,9 +854,10 @@ def execute_paper_trade(state, config, symbol, action, price, confidence, reason
         }
         
         state["positions"].append(position)
+        position_index(state)[symbol] = position
         
         decision = {
-            "timestamp": now.isoformat() + "Z",
+            "timestamp": now_iso,
             "action": "OPEN_LONG",
             "symbol": symbol,
             "price": price,
@@ -426,134 +865,161 @@ def execute_paper_trade(state, config, symbol, action, price, confidence, reason
             "value": position_size_eur,
             "confidence": confidence,
             "reason": reason,
-            "mlPrediction": ml_predictor.predict(symbol) if ml_predictor else None
+            "mlPrediction": ml_prediction
         }
         state["decisions"].append(decision)
         
         return position
     
     elif action == "close":
-        for i, pos in enumerate(state["positions"]):
-            if pos["symbol"] == symbol:
-                entry_price = pos["entryPrice"]
-                quantity = pos["quantity"]
-                pnl = (price - entry_price) * quantity
-                pnl_percent = ((price - entry_price) / entry_price) * 100
-                
-                state["portfolio"]["currentCapital"] += pnl
-                state["portfolio"]["realizedPnL"] += pnl
-                state["portfolio"]["totalPnL"] = state["portfolio"]["currentCapital"] - state["portfolio"]["initialCapital"]
-                state["portfolio"]["totalPnLPercent"] = (state["portfolio"]["totalPnL"] / state["portfolio"]["initialCapital"]) * 100
-                
-                if state["portfolio"]["currentCapital"] > state["portfolio"]["highWaterMark"]:
-                    state["portfolio"]["highWaterMark"] = state["portfolio"]["currentCapital"]
-                
-                current_dd = state["portfolio"]["highWaterMark"] - state["portfolio"]["currentCapital"]
-                current_dd_percent = (current_dd / state["portfolio"]["highWaterMark"]) * 100
-                if current_dd_percent > state["portfolio"]["maxDrawdownPercent"]:
-                    state["portfolio"]["maxDrawdownPercent"] = current_dd_percent
-                    state["portfolio"]["maxDrawdown"] = current_dd
-                
-                trade = {
-                    "id": pos["id"],
-                    "symbol": symbol,
-                    "direction": pos["direction"],
-                    "entryPrice": entry_price,
-                    "exitPrice": price,
-                    "quantity": quantity,
-                    "entryTime": pos["entryTime"],
-                    "exitTime": now.isoformat() + "Z",
-                    "pnl": round(pnl, 2),
-                    "pnlPercent": round(pnl_percent, 2),
-                    "isWin": pnl > 0,
-                    "reason": reason,
-                    "mlEnabled": pos.get("mlEnabled", False)
-                }
-                state["tradeHistory"].append(trade)
-                
-                stats = state["statistics"]
-                stats["totalTrades"] += 1
-                if pnl > 0:
-                    stats["winningTrades"] += 1
-                    if pnl > stats["largestWin"]:
-                        stats["largestWin"] = pnl
-                else:
-                    stats["losingTrades"] += 1
-                    if pnl < stats["largestLoss"]:
-                        stats["largestLoss"] = pnl
-                
-                if stats["totalTrades"] > 0:
-                    stats["winRate"] = (stats["winningTrades"] / stats["totalTrades"]) * 100
-                
-                decision = {
-                    "timestamp": now.isoformat() + "Z",
-                    "action": "CLOSE_LONG",
-                    "symbol": symbol,
-                    "entryPrice": entry_price,
-                    "exitPrice": price,
-                    "pnl": round(pnl, 2),
-                    "pnlPercent": round(pnl_percent, 2),
-                    "reason": reason
-                }
-                state["decisions"].append(decision)
-                
-                state["positions"].pop(i)
-                return trade
+        pos = position_index(state).pop(symbol, None)
+        if pos is None:
+            return None
+        
+        entry_price = pos["entryPrice"]
+        quantity = pos["quantity"]
+        pnl = (price - entry_price) * quantity
+        pnl_percent = ((price - entry_price) / entry_price) * 100
+        
+        state["portfolio"]["currentCapital"] += pnl
+        state["portfolio"]["realizedPnL"] += pnl
+        state["portfolio"]["totalPnL"] = state["portfolio"]["currentCapital"] - state["portfolio"]["initialCapital"]
+        state["portfolio"]["totalPnLPercent"] = (state["portfolio"]["totalPnL"] / state["portfolio"]["initialCapital"]) * 100
+        
+        if state["portfolio"]["currentCapital"] > state["portfolio"]["highWaterMark"]:
+            state["portfolio"]["highWaterMark"] = state["portfolio"]["currentCapital"]
+        
+        current_dd = state["portfolio"]["highWaterMark"] - state["portfolio"]["currentCapital"]
+        current_dd_percent = (current_dd / state["portfolio"]["highWaterMark"]) * 100
+        if current_dd_percent > state["portfolio"]["maxDrawdownPercent"]:
+            state["portfolio"]["maxDrawdownPercent"] = current_dd_percent
+            state["portfolio"]["maxDrawdown"] = current_dd
+        
+        trade = {
+            "id": pos["id"],
+            "symbol": symbol,
+            "direction": pos["direction"],
+            "entryPrice": entry_price,
+            "exitPrice": price,
+            "quantity": quantity,
+            "entryTime": pos["entryTime"],
+            "exitTime": now_iso,
+            "pnl": round(pnl, 2),
+            "pnlPercent": round(pnl_percent, 2),
+            "isWin": pnl > 0,
+            "reason": reason,
+            "mlEnabled": pos.get("mlEnabled", False)
+        }
+        state["tradeHistory"].append(trade)
+        
+        stats = state["statistics"]
+        stats["totalTrades"] += 1
+        if pnl > 0:
+            stats["winningTrades"] += 1
+        else:
+            stats["losingTrades"] += 1
+        stats["largestWin"] = max(stats["largestWin"], pnl)
+        stats["largestLoss"] = min(stats["largestLoss"], pnl)
+        stats["winRate"] = (stats["winningTrades"] / stats["totalTrades"]) * 100
+        
+        decision = {
+            "timestamp": now_iso,
+            "action": "CLOSE_LONG",
+            "symbol": symbol,
+            "entryPrice": entry_price,
+            "exitPrice": price,
+            "pnl": round(pnl, 2),
+            "pnlPercent": round(pnl_percent, 2),
+            "reason": reason
+        }
+        state["decisions"].append(decision)
+        
+        state["positions"].remove(pos)
+        return trade
     
     return None
 
 def update_unrealized_pnl(state, prices):
     """Update unrealized P&L for open positions"""
-    unrealized = 0
-    for pos in state["positions"]:
-        symbol = pos["symbol"]
-        if symbol in prices:
-            current_price = prices[symbol]["price"]
-            entry_price = pos["entryPrice"]
-            quantity = pos["quantity"]
-            pnl = (current_price - entry_price) * quantity
-            unrealized += pnl
+    positions = [pos for pos in state["positions"] if pos["symbol"] in prices]
+    unrealized = 0.0
+    
+    if positions:
+        # One vector pass over all priced positions
+        n = len(positions)
+        entries = np.fromiter((pos["entryPrice"] for pos in positions), dtype=np.float64, count=n)
+        quantities = np.fromiter((pos["quantity"] for pos in positions), dtype=np.float64, count=n)
+        currents = np.fromiter((prices[pos["symbol"]]["price"] for pos in positions), dtype=np.float64, count=n)
+        
+        pnl = (currents - entries) * quantities
+        pnl_percent = (currents - entries) / entries * 100
+        unrealized = float(pnl.sum())
+        
+        for pos, current_price, pos_pnl, pos_pct in zip(
+                positions, currents.tolist(), np.round(pnl, 2).tolist(), np.round(pnl_percent, 2).tolist()):
             pos["currentPrice"] = current_price
-            pos["unrealizedPnL"] = round(pnl, 2)
-            pos["unrealizedPnLPercent"] = round(((current_price - entry_price) / entry_price) * 100, 2)
+            pos["unrealizedPnL"] = pos_pnl
+            pos["unrealizedPnLPercent"] = pos_pct
     
     state["portfolio"]["unrealizedPnL"] = round(unrealized, 2)
 
-def run_trading_cycle():
-    """Main trading cycle - called periodically"""
+def run_trading_cycle(buffer: MarketBuffer = None):
+    """
+    Main trading cycle - called periodically.
+    With a running MarketBuffer prices are read from memory; otherwise
+    they are fetched synchronously for this cycle.
+    """
+    # One timestamp for the whole cycle
+    cycle_now = datetime.utcnow()
+    cycle_iso = cycle_now.isoformat() + "Z"
+    
     print(f"\n{'='*60}")
-    print(f"K.I.T. Autonomous Trader v2.0 - {datetime.utcnow().isoformat()}")
+    print(f"K.I.T. Autonomous Trader v2.0 - {cycle_now.isoformat()}")
     print(f"ML Predictions: {'ENABLED' if ML_AVAILABLE else 'DISABLED'}")
     print(f"{'='*60}")
     
     config = load_config()
+    enabled = [m for m in MARKET_FETCHERS if config["markets"][m]["enabled"]]
+    
+    # Requests go out before the state file is parsed so the two overlap
+    futures = submit_markets(enabled) if buffer is None else None
     state = load_state()
     
     all_prices = {}
     
-    if config["markets"]["crypto"]["enabled"]:
-        crypto_prices = get_crypto_prices()
+    if futures is not None:
+        fetched = {m: future.result() for m, future in futures.items()}
+    else:
+        snapshot = buffer.snapshot()
+        fetched = {m: snapshot[m] for m in enabled if m in snapshot}
+    
+    if "crypto" in fetched:
+        crypto_prices = fetched["crypto"]
         all_prices.update(crypto_prices)
         print(f"\n[CRYPTO] Prices:")
         for sym, data in crypto_prices.items():
             print(f"  {sym}: EUR {data['price']:,.2f} ({data['change']:+.1f}%)")
     
-    if config["markets"]["forex"]["enabled"]:
-        forex_prices = get_forex_prices()
+    if "forex" in fetched:
+        forex_prices = fetched["forex"]
         all_prices.update(forex_prices)
         print(f"\n[FOREX] Prices:")
         for sym, data in forex_prices.items():
             print(f"  {sym}: {data['price']:.5f} ({data['change']:+.2f}%)")
     
+    # Symbols without a quote (price 0) are dropped once, up front
+    all_prices = {sym: data for sym, data in all_prices.items() if data["price"]}
+    
     update_unrealized_pnl(state, all_prices)
     
     print(f"\n[K.I.T.] Analyzing markets...")
     
+    # Analysis only touches each symbol's own position, so the whole batch
+    # can be scored before any trade is executed
+    decisions = analyze_markets(all_prices, state)
+    
     for symbol, price_data in all_prices.items():
-        if price_data["price"] == 0:
-            continue
-            
-        action, confidence, reason = analyze_market(symbol, price_data, state)
+        action, confidence, reason, ml_prediction = decisions[symbol]
         
         if action in ["buy", "sell", "close"] and confidence >= config["strategy"]["minConfidenceScore"]:
             print(f"\n  >> {symbol}: {action.upper()} (Confidence: {confidence}%)")
@@ -561,7 +1027,8 @@ def run_trading_cycle():
             
             result = execute_paper_trade(
                 state, config, symbol, action, 
-                price_data["price"], confidence, reason
+                price_data["price"], confidence, reason, ml_prediction,
+                now=cycle_now, now_iso=cycle_iso
             )
             
             if result:
@@ -570,35 +1037,42 @@ def run_trading_cycle():
                 elif action == "close":
                     print(f"     [OK] Closed position: P&L EUR {result['pnl']:+.2f} ({result['pnlPercent']:+.1f}%)")
     
-    save_state(state)
+    save_state(state, cycle_iso)
     
+    # Summary is assembled first and written to stdout in one call
     portfolio = state["portfolio"]
-    print(f"\n{'='*60}")
-    print(f"[PORTFOLIO]")
-    print(f"{'='*60}")
-    print(f"  Initial Capital:  EUR {portfolio['initialCapital']:,.2f}")
-    print(f"  Current Capital:  EUR {portfolio['currentCapital']:,.2f}")
-    print(f"  Total P&L:        EUR {portfolio['totalPnL']:+,.2f} ({portfolio['totalPnLPercent']:+.1f}%)")
-    print(f"  Realized P&L:     EUR {portfolio['realizedPnL']:+,.2f}")
-    print(f"  Unrealized P&L:   EUR {portfolio['unrealizedPnL']:+,.2f}")
-    print(f"  Max Drawdown:     {portfolio['maxDrawdownPercent']:.1f}%")
-    print(f"  Open Positions:   {len(state['positions'])}")
+    lines = [
+        f"\n{'='*60}",
+        f"[PORTFOLIO]",
+        f"{'='*60}",
+        f"  Initial Capital:  EUR {portfolio['initialCapital']:,.2f}",
+        f"  Current Capital:  EUR {portfolio['currentCapital']:,.2f}",
+        f"  Total P&L:        EUR {portfolio['totalPnL']:+,.2f} ({portfolio['totalPnLPercent']:+.1f}%)",
+        f"  Realized P&L:     EUR {portfolio['realizedPnL']:+,.2f}",
+        f"  Unrealized P&L:   EUR {portfolio['unrealizedPnL']:+,.2f}",
+        f"  Max Drawdown:     {portfolio['maxDrawdownPercent']:.1f}%",
+        f"  Open Positions:   {len(state['positions'])}",
+    ]
     
     stats = state["statistics"]
     if stats["totalTrades"] > 0:
-        print(f"\n[STATISTICS]")
-        print(f"  Total Trades:     {stats['totalTrades']}")
-        print(f"  Win Rate:         {stats['winRate']:.1f}%")
-        print(f"  Largest Win:      EUR {stats['largestWin']:+,.2f}")
-        print(f"  Largest Loss:     EUR {stats['largestLoss']:+,.2f}")
+        lines += [
+            f"\n[STATISTICS]",
+            f"  Total Trades:     {stats['totalTrades']}",
+            f"  Win Rate:         {stats['winRate']:.1f}%",
+            f"  Largest Win:      EUR {stats['largestWin']:+,.2f}",
+            f"  Largest Loss:     EUR {stats['largestLoss']:+,.2f}",
+        ]
     
     if state["positions"]:
-        print(f"\n[OPEN POSITIONS]")
+        lines.append(f"\n[OPEN POSITIONS]")
         for pos in state["positions"]:
             ml_tag = "[ML]" if pos.get("mlEnabled") else ""
-            print(f"  {pos['symbol']}: {pos['direction'].upper()} @ EUR {pos['entryPrice']:,.2f} {ml_tag}")
+            lines.append(f"  {pos['symbol']}: {pos['direction'].upper()} @ EUR {pos['entryPrice']:,.2f} {ml_tag}")
             if "unrealizedPnL" in pos:
-                print(f"    Current: EUR {pos.get('currentPrice', 0):,.2f} | P&L: EUR {pos['unrealizedPnL']:+,.2f} ({pos['unrealizedPnLPercent']:+.1f}%)")
+                lines.append(f"    Current: EUR {pos.get('currentPrice', 0):,.2f} | P&L: EUR {pos['unrealizedPnL']:+,.2f} ({pos['unrealizedPnLPercent']:+.1f}%)")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return state
 
@@ -628,21 +1102,23 @@ ML Predictions: {ml_status}
 [Open Positions: {len(state['positions'])}]
 """
     
+    # Collected in a list and joined once instead of repeated string +=
+    parts = [report]
     for pos in state["positions"]:
         pnl = pos.get('unrealizedPnL', 0)
         pnl_pct = pos.get('unrealizedPnLPercent', 0)
         tag = "[+]" if pnl >= 0 else "[-]"
-        report += f"\n{tag} {pos['symbol']}: EUR {pnl:+,.2f} ({pnl_pct:+.1f}%)"
+        parts.append(f"\n{tag} {pos['symbol']}: EUR {pnl:+,.2f} ({pnl_pct:+.1f}%)")
     
     if state["tradeHistory"]:
         recent = state["tradeHistory"][-3:]
-        report += f"\n\n[Recent Trades]"
+        parts.append(f"\n\n[Recent Trades]")
         for trade in recent:
             tag = "[W]" if trade["isWin"] else "[L]"
             ml_tag = " (ML)" if trade.get("mlEnabled") else ""
-            report += f"\n{tag} {trade['symbol']}: EUR {trade['pnl']:+,.2f}{ml_tag}"
+            parts.append(f"\n{tag} {trade['symbol']}: EUR {trade['pnl']:+,.2f}{ml_tag}")
     
-    return report
+    return "".join(parts)
 
 if __name__ == "__main__":
     import sys
@@ -663,5 +1139,17 @@ if __name__ == "__main__":
             print(f"BTC/EUR: {direction} ({confidence}%)")
         else:
             print("ML not available!")
+    elif len(sys.argv) > 1 and sys.argv[1] == "--loop":
+        # Long-running mode: prices refresh in the background between cycles
+        interval = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+        markets = [m for m in MARKET_FETCHERS if load_config()["markets"][m]["enabled"]]
+        buffer = MarketBuffer(markets, interval=min(interval, 15.0), staleness_budget=interval)
+        buffer.start()
+        try:
+            while True:
+                run_trading_cycle(buffer)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            buffer.stop()
     else:
         run_trading_cycle()
@@ -8,21 +8,46 @@ Macht eigenständige Trading-Entscheidungen mit echten Marktdaten.
 import json
 import os
 import sys
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-import random
+import numpy as np
 
 # Fix Windows console encoding
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+# orjson: much faster state serialization, stdlib json as fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Paths
 BASE_DIR = Path(__file__).parent
 CONFIG_FILE = BASE_DIR / "config.json"
 STATE_FILE = BASE_DIR / "state.json"
 LOG_DIR = BASE_DIR / "logs"
 
+# Shared HTTP session - keeps CoinGecko connections alive between polls
+# and retries rate-limited (429) or failed requests with backoff
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
+SESSION.headers["Accept-Encoding"] = "gzip"
+
+# Worker pool for market fetches, so crypto and forex are requested in parallel
+EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kit-fetch")
+
 # Ensure log directory exists
 LOG_DIR.mkdir(exist_ok=True)
 
@@ -34,101 +59,257 @@ def load_state():
     with open(STATE_FILE) as f:
         return json.load(f)
 
-def save_state(state):
-    state["lastUpdate"] = datetime.utcnow().isoformat() + "Z"
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+def position_index(state):
+    """
+    symbol -> open position: the working store for open positions.
+    Built on first use after a load; opening and closing only touch this
+    dict, and save_state writes it back to the state["positions"] list
+    ("_"-prefixed keys themselves are not saved).
+    """
+    index = state.get("_positionIndex")
+    if index is None:
+        index = state["_positionIndex"] = {pos["symbol"]: pos for pos in state["positions"]}
+    return index
+
+# Bounded history kept in state.json; statistics are tracked incrementally
+# and do not depend on the full lists
+MAX_DECISIONS = 500
+MAX_TRADE_HISTORY = 1000
+
+def save_state(state, now_iso: str = None):
+    state["lastUpdate"] = now_iso or datetime.utcnow().isoformat() + "Z"
+    del state["decisions"][:-MAX_DECISIONS]
+    del state["tradeHistory"][:-MAX_TRADE_HISTORY]
+    
+    # Dicts keep insertion order, so positions are saved in opening order
+    state["positions"] = list(position_index(state).values())
+    # Compact JSON - the file is machine-read; use --dump to look at it
+    persisted = {k: v for k, v in state.items() if not k.startswith("_")}
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(persisted)
+    else:
+        payload = json.dumps(persisted, separators=(",", ":")).encode("utf-8")
+    
+    # Write to a temp file, then rename atomically: a crash mid-write can
+    # never leave a truncated state.json behind
+    tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_FILE)
+
+# Quoted symbol -> CoinGecko coin id; the request's ids= list is built from it
+CRYPTO_MAP = (
+    ("BTC/EUR", "bitcoin"),
+    ("ETH/EUR", "ethereum"),
+    ("SOL/EUR", "solana"),
+    ("BNB/EUR", "binancecoin"),
+    ("XRP/EUR", "ripple"),
+)
+_COINGECKO_PARAMS = {
+    "ids": ",".join(cg_id for _, cg_id in CRYPTO_MAP),
+    "vs_currencies": "eur",
+    "include_24hr_change": "true"
+}
+_EMPTY = {}
+
+# Last CoinGecko answer, kept on disk so that back-to-back runs (cron, the
+# TS tools) share it: served as-is for CRYPTO_CACHE_TTL, then revalidated
+# with ETag / Last-Modified; on a failed fetch (e.g. throttled) it stands
+# in for up to CRYPTO_MAX_STALE
+CRYPTO_CACHE_FILE = LOG_DIR / ".cg_cache.json"
+CRYPTO_CACHE_TTL = 30  # seconds
+CRYPTO_MAX_STALE = 300  # seconds
+# Once the API reports no requests left, don't ask again for this long
+CRYPTO_RATE_LIMIT_BACKOFF = 60  # seconds
+
+def _read_crypto_cache():
+    """(age in seconds, cache dict) or (None, None) without a usable cache"""
+    try:
+        age = time.time() - os.stat(CRYPTO_CACHE_FILE).st_mtime
+        with open(CRYPTO_CACHE_FILE) as f:
+            return age, json.load(f)
+    except (OSError, ValueError):
+        return None, None
+
+def _write_crypto_cache(cache):
+    tmp = CRYPTO_CACHE_FILE.with_name(CRYPTO_CACHE_FILE.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp, CRYPTO_CACHE_FILE)
+
+def _stale_crypto_prices(cache, age):
+    """
+    Last known quotes with the 24h change zeroed: open positions are still
+    managed, but no new entry is scored on old momentum
+    """
+    print(f"Using cached crypto prices ({age:.0f}s old)")
+    return {symbol: {"price": quote["price"], "change": 0} for symbol, quote in cache["prices"].items()}
 
 def get_crypto_prices():
     """Fetch real crypto prices from CoinGecko"""
+    age, cache = _read_crypto_cache()
+    if cache is not None and age < CRYPTO_CACHE_TTL:
+        return cache["prices"]
+    if cache is not None and cache.get("rateLimitRemaining") == 0 and age < CRYPTO_RATE_LIMIT_BACKOFF:
+        # Request budget used up - a fetch now would only be throttled
+        return _stale_crypto_prices(cache, age)
+    
     try:
+        headers = {}
+        if cache is not None:
+            if cache.get("etag"):
+                headers["If-None-Match"] = cache["etag"]
+            if cache.get("lastModified"):
+                headers["If-Modified-Since"] = cache["lastModified"]
+        
         url = "https://api.coingecko.com/api/v3/simple/price"
-        params = {
-            "ids": "bitcoin,ethereum,solana,binancecoin,ripple",
-            "vs_currencies": "eur",
-            "include_24hr_change": "true"
-        }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = SESSION.get(url, params=_COINGECKO_PARAMS, headers=headers, timeout=10)
+        
+        if resp.status_code == 304 and cache is not None:
+            # Unchanged - restart the TTL without rewriting the body
+            os.utime(CRYPTO_CACHE_FILE)
+            return cache["prices"]
+        resp.raise_for_status()
+        
         data = resp.json()
-        return {
-            "BTC/EUR": {"price": data.get("bitcoin", {}).get("eur", 0), "change": data.get("bitcoin", {}).get("eur_24h_change", 0)},
-            "ETH/EUR": {"price": data.get("ethereum", {}).get("eur", 0), "change": data.get("ethereum", {}).get("eur_24h_change", 0)},
-            "SOL/EUR": {"price": data.get("solana", {}).get("eur", 0), "change": data.get("solana", {}).get("eur_24h_change", 0)},
-            "BNB/EUR": {"price": data.get("binancecoin", {}).get("eur", 0), "change": data.get("binancecoin", {}).get("eur_24h_change", 0)},
-            "XRP/EUR": {"price": data.get("ripple", {}).get("eur", 0), "change": data.get("ripple", {}).get("eur_24h_change", 0)},
-        }
+        prices = {}
+        for symbol, cg_id in CRYPTO_MAP:
+            coin = data.get(cg_id, _EMPTY)
+            prices[symbol] = {"price": coin.get("eur", 0), "change": coin.get("eur_24h_change", 0)}
+        
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        _write_crypto_cache({
+            "etag": resp.headers.get("ETag"),
+            "lastModified": resp.headers.get("Last-Modified"),
+            "rateLimitRemaining": int(remaining) if remaining and remaining.isdigit() else None,
+            "prices": prices,
+        })
+        return prices
     except Exception as e:
         print(f"Error fetching crypto prices: {e}")
+        if cache is not None and age < CRYPTO_MAX_STALE:
+            return _stale_crypto_prices(cache, age)
         return {}
 
+# Simulated forex: fixed base rates with random fluctuation
+FOREX_BASE_RATES = {
+    "EUR/USD": 1.0820,
+    "GBP/USD": 1.2650,
+    "USD/JPY": 149.50,
+    "EUR/GBP": 0.8550,
+    "AUD/USD": 0.6520,
+}
+_FOREX_PAIRS = tuple(FOREX_BASE_RATES)
+_FOREX_BASES = np.array(list(FOREX_BASE_RATES.values()))
+
+# Separate generators: forex is simulated on a fetch thread, market noise
+# on the main thread, and a Generator must not be shared between them
+_FOREX_RNG = np.random.default_rng()
+_NOISE_RNG = np.random.default_rng()
+
 def get_forex_prices():
     """Fetch forex prices (using exchangerate.host free API)"""
     try:
-        # Using approximate rates - in production would use proper forex API
-        base_rates = {
-            "EUR/USD": 1.0820,
-            "GBP/USD": 1.2650,
-            "USD/JPY": 149.50,
-            "EUR/GBP": 0.8550,
-            "AUD/USD": 0.6520,
+        # Using approximate rates - in production would use proper forex API.
+        # Small random fluctuation to simulate live market, drawn for all pairs at once
+        n = len(_FOREX_PAIRS)
+        rates = np.round(_FOREX_BASES * (1 + _FOREX_RNG.uniform(-0.002, 0.002, size=n)), 5)
+        changes = np.round(_FOREX_RNG.uniform(-0.5, 0.5, size=n), 2)
+        return {
+            pair: {"price": price, "change": change}
+            for pair, price, change in zip(_FOREX_PAIRS, rates.tolist(), changes.tolist())
         }
-        # Add small random fluctuation to simulate live market
-        prices = {}
-        for pair, base in base_rates.items():
-            fluctuation = random.uniform(-0.002, 0.002)
-            prices[pair] = {
-                "price": round(base * (1 + fluctuation), 5),
-                "change": round(random.uniform(-0.5, 0.5), 2)
-            }
-        return prices
     except Exception as e:
         print(f"Error fetching forex prices: {e}")
         return {}
 
-def analyze_market(symbol, price_data, state):
+# Trend + mean-reversion score per 24h-change band, split at RULE_THRESHOLDS
+RULE_THRESHOLDS = (-3, -2, -0.5, 0.5, 2, 3)
+RULE_BANDS = (
+    (-15 + 10, ("Strong bearish momentum", "Potential oversold bounce")),
+    (-15, ("Strong bearish momentum",)),
+    (-8, ("Mild bearish",)),
+    (0, ()),
+    (8, ("Mild bullish",)),
+    (15, ("Strong bullish momentum",)),
+    (15 - 10, ("Strong bullish momentum", "Potential overbought pullback")),
+)
+_RULE_EDGES = np.array(RULE_THRESHOLDS, dtype=np.float64)
+_RULE_DELTAS = np.array([delta for delta, _ in RULE_BANDS])
+
+def rule_bands(changes):
+    """RULE_BANDS index for a whole vector of 24h changes"""
+    return np.where(
+        changes < 0,
+        np.searchsorted(_RULE_EDGES, changes, side="right"),
+        np.searchsorted(_RULE_EDGES, changes, side="left"),
+    )
+
+MARKET_FETCHERS = {
+    "crypto": get_crypto_prices,
+    "forex": get_forex_prices,
+}
+
+def submit_markets(markets):
+    """Start fetching several markets on the shared executor; returns futures"""
+    return {market: EXECUTOR.submit(MARKET_FETCHERS[market]) for market in markets}
+
+def analyze_markets(prices, state):
+    """
+    analyze_market for every priced symbol in one vector pass: bands,
+    noise and scores are computed for all symbols at once, and only
+    symbols with an open position or a score in entry range go through
+    the per-symbol logic.
+    Returns: symbol -> (action, confidence, reason)
+    """
+    symbols = [symbol for symbol, data in prices.items() if data["price"]]
+    n = len(symbols)
+    changes = np.fromiter((prices[s].get("change", 0) for s in symbols), np.float64, n)
+    bands = rule_bands(changes)
+    noise = _NOISE_RNG.integers(-10, 11, size=n)
+    scores = 50 + _RULE_DELTAS[bands] + noise
+    
+    open_positions = position_index(state)
+    decisions = {}
+    for symbol, band, z, score in zip(symbols, bands.tolist(), noise.tolist(), scores.tolist()):
+        if symbol in open_positions or score >= 65 or score <= 35:
+            decisions[symbol] = analyze_market(symbol, prices[symbol], state, noise=z, band=band)
+        else:
+            decisions[symbol] = ("hold", 50, "No clear setup")
+    return decisions
+
+def analyze_market(symbol, price_data, state, noise=None, band=None):
     """
     AI-like analysis of market conditions.
+    noise / band are the symbol's pre-computed market noise and
+    RULE_BANDS index from analyze_markets, derived here when not given.
     Returns: action (buy/sell/hold), confidence (0-100), reason
     """
     price = price_data.get("price", 0)
     change = price_data.get("change", 0)
     
     # Check if we have an open position
-    open_position = None
-    for pos in state["positions"]:
-        if pos["symbol"] == symbol:
-            open_position = pos
-            break
+    open_position = position_index(state).get(symbol)
     
     # Simple but effective decision logic
     signals = []
     score = 50  # Start neutral
     
-    # Trend analysis
-    if change > 2:
-        signals.append("Strong bullish momentum")
-        score += 15
-    elif change > 0.5:
-        signals.append("Mild bullish")
-        score += 8
-    elif change < -2:
-        signals.append("Strong bearish momentum")
-        score -= 15
-    elif change < -0.5:
-        signals.append("Mild bearish")
-        score -= 8
-    
-    # Mean reversion opportunity
-    if change < -3:
-        signals.append("Potential oversold bounce")
-        score += 10
-    elif change > 3:
-        signals.append("Potential overbought pullback")
-        score -= 10
+    # Trend analysis + mean reversion opportunity - one band lookup.
+    # Negative thresholds are exclusive (change < -2), positive ones too
+    # (change > 2), hence bisect_right below zero and bisect_left above.
+    if band is None:
+        band = bisect_right(RULE_THRESHOLDS, change) if change < 0 else bisect_left(RULE_THRESHOLDS, change)
+    delta, band_signals = RULE_BANDS[band]
+    score += delta
+    signals.extend(band_signals)
     
     # Add some randomness for varied behavior
-    market_noise = random.randint(-10, 10)
-    score += market_noise
+    if noise is None:
+        noise = int(_NOISE_RNG.integers(-10, 11))
+    score += noise
     
     # Determine action
     if open_position:
@@ -152,18 +333,43 @@ def analyze_market(symbol, price_data, state):
     
     return "hold", 50, "No clear setup"
 
-def execute_paper_trade(state, config, symbol, action, price, confidence, reason):
-    """Execute a paper trade and update state"""
-    now = datetime.utcnow()
+def risk_params(config):
+    """
+    (position fraction, max open positions, stop-loss multiplier,
+    take-profit multiplier) from config["riskManagement"]
+    """
+    rm = config["riskManagement"]
+    return (
+        rm["maxPositionSizePercent"] / 100,
+        rm["maxOpenPositions"],
+        1 - rm["defaultStopLossPercent"] / 100,
+        1 + rm["defaultTakeProfitPercent"] / 100,
+    )
+
+def execute_paper_trade(state, config, symbol, action, price, confidence, reason,
+                        now=None, now_iso=None, risk=None):
+    """
+    Execute a paper trade and update state.
+    now / now_iso let the caller stamp every trade of a cycle with one
+    timestamp instead of formatting a new one per record; risk takes the
+    cycle's risk_params(config).
+    """
+    if now is None:
+        now = datetime.utcnow()
+    if now_iso is None:
+        now_iso = now.isoformat() + "Z"
     capital = state["portfolio"]["currentCapital"]
     
     if action == "buy":
+        position_fraction, max_open, sl_mult, tp_mult = risk or risk_params(config)
+        
         # Calculate position size (max 10% of capital)
-        position_size_eur = capital * (config["riskManagement"]["maxPositionSizePercent"] / 100)
+        position_size_eur = capital * position_fraction
         quantity = position_size_eur / price
         
         # Check max open positions
-        if len(state["positions"]) >= config["riskManagement"]["maxOpenPositions"]:
+        positions = position_index(state)
+        if len(positions) >= max_open:
             return None
         
         # Create position
@@ -173,18 +379,18 @@ def execute_paper_trade(state, config, symbol, action, price, confidence, reason
             "direction": "long",
             "entryPrice": price,
             "quantity": quantity,
-            "entryTime": now.isoformat() + "Z",
-            "stopLoss": price * (1 - config["riskManagement"]["defaultStopLossPercent"] / 100),
-            "takeProfit": price * (1 + config["riskManagement"]["defaultTakeProfitPercent"] / 100),
+            "entryTime": now_iso,
+            "stopLoss": price * sl_mult,
+            "takeProfit": price * tp_mult,
             "confidence": confidence,
             "reason": reason
         }
         
-        state["positions"].append(position)
+        positions[symbol] = position
         
         # Log decision
         decision = {
-            "timestamp": now.isoformat() + "Z",
+            "timestamp": now_iso,
             "action": "OPEN_LONG",
             "symbol": symbol,
             "price": price,
@@ -199,123 +405,139 @@ def execute_paper_trade(state, config, symbol, action, price, confidence, reason
     
     elif action == "close":
         # Find and close position
-        for i, pos in enumerate(state["positions"]):
-            if pos["symbol"] == symbol:
-                # Calculate P&L
-                entry_price = pos["entryPrice"]
-                quantity = pos["quantity"]
-                pnl = (price - entry_price) * quantity
-                pnl_percent = ((price - entry_price) / entry_price) * 100
-                
-                # Update portfolio
-                state["portfolio"]["currentCapital"] += pnl
-                state["portfolio"]["realizedPnL"] += pnl
-                state["portfolio"]["totalPnL"] = state["portfolio"]["currentCapital"] - state["portfolio"]["initialCapital"]
-                state["portfolio"]["totalPnLPercent"] = (state["portfolio"]["totalPnL"] / state["portfolio"]["initialCapital"]) * 100
-                
-                # Update high water mark and drawdown
-                if state["portfolio"]["currentCapital"] > state["portfolio"]["highWaterMark"]:
-                    state["portfolio"]["highWaterMark"] = state["portfolio"]["currentCapital"]
-                
-                current_dd = state["portfolio"]["highWaterMark"] - state["portfolio"]["currentCapital"]
-                current_dd_percent = (current_dd / state["portfolio"]["highWaterMark"]) * 100
-                if current_dd_percent > state["portfolio"]["maxDrawdownPercent"]:
-                    state["portfolio"]["maxDrawdownPercent"] = current_dd_percent
-                    state["portfolio"]["maxDrawdown"] = current_dd
-                
-                # Record trade in history
-                trade = {
-                    "id": pos["id"],
-                    "symbol": symbol,
-                    "direction": pos["direction"],
-                    "entryPrice": entry_price,
-                    "exitPrice": price,
-                    "quantity": quantity,
-                    "entryTime": pos["entryTime"],
-                    "exitTime": now.isoformat() + "Z",
-                    "pnl": round(pnl, 2),
-                    "pnlPercent": round(pnl_percent, 2),
-                    "isWin": pnl > 0,
-                    "reason": reason
-                }
-                state["tradeHistory"].append(trade)
-                
-                # Update statistics
-                stats = state["statistics"]
-                stats["totalTrades"] += 1
-                if pnl > 0:
-                    stats["winningTrades"] += 1
-                    if pnl > stats["largestWin"]:
-                        stats["largestWin"] = pnl
-                else:
-                    stats["losingTrades"] += 1
-                    if pnl < stats["largestLoss"]:
-                        stats["largestLoss"] = pnl
-                
-                if stats["totalTrades"] > 0:
-                    stats["winRate"] = (stats["winningTrades"] / stats["totalTrades"]) * 100
-                
-                # Log decision
-                decision = {
-                    "timestamp": now.isoformat() + "Z",
-                    "action": "CLOSE_LONG",
-                    "symbol": symbol,
-                    "entryPrice": entry_price,
-                    "exitPrice": price,
-                    "pnl": round(pnl, 2),
-                    "pnlPercent": round(pnl_percent, 2),
-                    "reason": reason
-                }
-                state["decisions"].append(decision)
-                
-                # Remove position
-                state["positions"].pop(i)
-                return trade
+        pos = position_index(state).pop(symbol, None)
+        if pos is None:
+            return None
+        
+        # Calculate P&L
+        entry_price = pos["entryPrice"]
+        quantity = pos["quantity"]
+        pnl = (price - entry_price) * quantity
+        pnl_percent = ((price - entry_price) / entry_price) * 100
+        
+        # Update portfolio - computed on locals, each field written once
+        portfolio = state["portfolio"]
+        initial_capital = portfolio["initialCapital"]
+        current_capital = portfolio["currentCapital"] + pnl
+        total_pnl = current_capital - initial_capital
+        portfolio["currentCapital"] = current_capital
+        portfolio["realizedPnL"] += pnl
+        portfolio["totalPnL"] = total_pnl
+        portfolio["totalPnLPercent"] = (total_pnl / initial_capital) * 100
+        
+        # Update high water mark and drawdown
+        high_water_mark = max(portfolio["highWaterMark"], current_capital)
+        portfolio["highWaterMark"] = high_water_mark
+        
+        current_dd = high_water_mark - current_capital
+        current_dd_percent = (current_dd / high_water_mark) * 100
+        if current_dd_percent > portfolio["maxDrawdownPercent"]:
+            portfolio["maxDrawdownPercent"] = current_dd_percent
+            portfolio["maxDrawdown"] = current_dd
+        
+        # Record trade in history
+        trade = {
+            "id": pos["id"],
+            "symbol": symbol,
+            "direction": pos["direction"],
+            "entryPrice": entry_price,
+            "exitPrice": price,
+            "quantity": quantity,
+            "entryTime": pos["entryTime"],
+            "exitTime": now_iso,
+            "pnl": round(pnl, 2),
+            "pnlPercent": round(pnl_percent, 2),
+            "isWin": pnl > 0,
+            "reason": reason
+        }
+        state["tradeHistory"].append(trade)
+        
+        # Update statistics
+        stats = state["statistics"]
+        stats["totalTrades"] += 1
+        if pnl > 0:
+            stats["winningTrades"] += 1
+        else:
+            stats["losingTrades"] += 1
+        stats["largestWin"] = max(stats["largestWin"], pnl)
+        stats["largestLoss"] = min(stats["largestLoss"], pnl)
+        stats["winRate"] = (stats["winningTrades"] / stats["totalTrades"]) * 100
+        
+        # Log decision
+        decision = {
+            "timestamp": now_iso,
+            "action": "CLOSE_LONG",
+            "symbol": symbol,
+            "entryPrice": entry_price,
+            "exitPrice": price,
+            "pnl": round(pnl, 2),
+            "pnlPercent": round(pnl_percent, 2),
+            "reason": reason
+        }
+        state["decisions"].append(decision)
+        return trade
     
     return None
 
 def update_unrealized_pnl(state, prices):
     """Update unrealized P&L for open positions"""
+    positions = [pos for pos in position_index(state).values() if pos["symbol"] in prices]
     unrealized = 0
-    for pos in state["positions"]:
-        symbol = pos["symbol"]
-        if symbol in prices:
-            current_price = prices[symbol]["price"]
-            entry_price = pos["entryPrice"]
-            quantity = pos["quantity"]
-            pnl = (current_price - entry_price) * quantity
-            unrealized += pnl
+    
+    if positions:
+        # One vector pass over all priced positions
+        n = len(positions)
+        entries = np.fromiter((pos["entryPrice"] for pos in positions), dtype=np.float64, count=n)
+        quantities = np.fromiter((pos["quantity"] for pos in positions), dtype=np.float64, count=n)
+        currents = np.fromiter((prices[pos["symbol"]]["price"] for pos in positions), dtype=np.float64, count=n)
+        
+        pnl = (currents - entries) * quantities
+        pnl_percent = (currents - entries) / entries * 100
+        unrealized = float(pnl.sum())
+        
+        for pos, current_price, pos_pnl, pos_pct in zip(
+                positions, currents.tolist(), np.round(pnl, 2).tolist(), np.round(pnl_percent, 2).tolist()):
             pos["currentPrice"] = current_price
-            pos["unrealizedPnL"] = round(pnl, 2)
-            pos["unrealizedPnLPercent"] = round(((current_price - entry_price) / entry_price) * 100, 2)
+            pos["unrealizedPnL"] = pos_pnl
+            pos["unrealizedPnLPercent"] = pos_pct
     
     state["portfolio"]["unrealizedPnL"] = round(unrealized, 2)
 
 def run_trading_cycle():
     """Main trading cycle - called periodically"""
+    # One timestamp for the whole cycle
+    cycle_now = datetime.utcnow()
+    cycle_iso = cycle_now.isoformat() + "Z"
+    
     print(f"\n{'='*60}")
-    print(f"K.I.T. Autonomous Trader - {datetime.utcnow().isoformat()}")
+    print(f"K.I.T. Autonomous Trader - {cycle_now.isoformat()}")
     print(f"{'='*60}")
     
     config = load_config()
+    enabled = [m for m in MARKET_FETCHERS if config["markets"][m]["enabled"]]
+    risk = risk_params(config)
+    
+    # Get market prices - all markets at once, requested before the state
+    # file is parsed so the two overlap
+    futures = submit_markets(enabled)
     state = load_state()
+    fetched = {m: future.result() for m, future in futures.items()}
     
-    # Get market prices
     all_prices = {}
     
-    if config["markets"]["crypto"]["enabled"]:
-        crypto_prices = get_crypto_prices()
+    if "crypto" in fetched:
+        crypto_prices = fetched["crypto"]
         all_prices.update(crypto_prices)
-        print(f"\n📊 Crypto Prices:")
-        for sym, data in crypto_prices.items():
-            print(f"  {sym}: €{data['price']:,.2f} ({data['change']:+.1f}%)")
+        lines = [f"\n📊 Crypto Prices:"]
+        lines += [f"  {sym}: €{data['price']:,.2f} ({data['change']:+.1f}%)" for sym, data in crypto_prices.items()]
+        sys.stdout.write("\n".join(lines) + "\n")
     
-    if config["markets"]["forex"]["enabled"]:
-        forex_prices = get_forex_prices()
+    if "forex" in fetched:
+        forex_prices = fetched["forex"]
         all_prices.update(forex_prices)
-        print(f"\n💱 Forex Prices:")
-        for sym, data in forex_prices.items():
-            print(f"  {sym}: {data['price']:.5f} ({data['change']:+.2f}%)")
+        lines = [f"\n💱 Forex Prices:"]
+        lines += [f"  {sym}: {data['price']:.5f} ({data['change']:+.2f}%)" for sym, data in forex_prices.items()]
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Update unrealized P&L
     update_unrealized_pnl(state, all_prices)
@@ -323,11 +545,12 @@ def run_trading_cycle():
     # Analyze each symbol and make decisions
     print(f"\n🤖 K.I.T. Analyzing markets...")
     
-    for symbol, price_data in all_prices.items():
-        if price_data["price"] == 0:
-            continue
-            
-        action, confidence, reason = analyze_market(symbol, price_data, state)
+    # Analysis only touches each symbol's own position, so the whole batch
+    # can be scored before any trade is executed
+    decisions = analyze_markets(all_prices, state)
+    
+    for symbol, (action, confidence, reason) in decisions.items():
+        price_data = all_prices[symbol]
         
         if action in ["buy", "sell", "close"] and confidence >= config["strategy"]["minConfidenceScore"]:
             print(f"\n  📍 {symbol}: {action.upper()} (Confidence: {confidence}%)")
@@ -335,7 +558,8 @@ def run_trading_cycle():
             
             result = execute_paper_trade(
                 state, config, symbol, action, 
-                price_data["price"], confidence, reason
+                price_data["price"], confidence, reason,
+                now=cycle_now, now_iso=cycle_iso, risk=risk
             )
             
             if result:
@@ -345,35 +569,41 @@ def run_trading_cycle():
                     print(f"     ✅ Closed position: P&L €{result['pnl']:+.2f} ({result['pnlPercent']:+.1f}%)")
     
     # Save state
-    save_state(state)
+    save_state(state, cycle_iso)
     
-    # Print summary
+    # Summary is assembled first and written to stdout in one call
     portfolio = state["portfolio"]
-    print(f"\n{'='*60}")
-    print(f"📊 PORTFOLIO SUMMARY")
-    print(f"{'='*60}")
-    print(f"  Initial Capital:  €{portfolio['initialCapital']:,.2f}")
-    print(f"  Current Capital:  €{portfolio['currentCapital']:,.2f}")
-    print(f"  Total P&L:        €{portfolio['totalPnL']:+,.2f} ({portfolio['totalPnLPercent']:+.1f}%)")
-    print(f"  Realized P&L:     €{portfolio['realizedPnL']:+,.2f}")
-    print(f"  Unrealized P&L:   €{portfolio['unrealizedPnL']:+,.2f}")
-    print(f"  Max Drawdown:     {portfolio['maxDrawdownPercent']:.1f}%")
-    print(f"  Open Positions:   {len(state['positions'])}")
+    lines = [
+        f"\n{'='*60}",
+        f"📊 PORTFOLIO SUMMARY",
+        f"{'='*60}",
+        f"  Initial Capital:  €{portfolio['initialCapital']:,.2f}",
+        f"  Current Capital:  €{portfolio['currentCapital']:,.2f}",
+        f"  Total P&L:        €{portfolio['totalPnL']:+,.2f} ({portfolio['totalPnLPercent']:+.1f}%)",
+        f"  Realized P&L:     €{portfolio['realizedPnL']:+,.2f}",
+        f"  Unrealized P&L:   €{portfolio['unrealizedPnL']:+,.2f}",
+        f"  Max Drawdown:     {portfolio['maxDrawdownPercent']:.1f}%",
+        f"  Open Positions:   {len(state['positions'])}",
+    ]
     
     stats = state["statistics"]
     if stats["totalTrades"] > 0:
-        print(f"\n📈 STATISTICS")
-        print(f"  Total Trades:     {stats['totalTrades']}")
-        print(f"  Win Rate:         {stats['winRate']:.1f}%")
-        print(f"  Largest Win:      €{stats['largestWin']:+,.2f}")
-        print(f"  Largest Loss:     €{stats['largestLoss']:+,.2f}")
+        lines += [
+            f"\n📈 STATISTICS",
+            f"  Total Trades:     {stats['totalTrades']}",
+            f"  Win Rate:         {stats['winRate']:.1f}%",
+            f"  Largest Win:      €{stats['largestWin']:+,.2f}",
+            f"  Largest Loss:     €{stats['largestLoss']:+,.2f}",
+        ]
     
     if state["positions"]:
-        print(f"\n📍 OPEN POSITIONS")
+        lines.append(f"\n📍 OPEN POSITIONS")
         for pos in state["positions"]:
-            print(f"  {pos['symbol']}: {pos['direction'].upper()} @ €{pos['entryPrice']:,.2f}")
+            lines.append(f"  {pos['symbol']}: {pos['direction'].upper()} @ €{pos['entryPrice']:,.2f}")
             if "unrealizedPnL" in pos:
-                print(f"    Current: €{pos.get('currentPrice', 0):,.2f} | P&L: €{pos['unrealizedPnL']:+,.2f} ({pos['unrealizedPnLPercent']:+.1f}%)")
+                lines.append(f"    Current: €{pos.get('currentPrice', 0):,.2f} | P&L: €{pos['unrealizedPnL']:+,.2f} ({pos['unrealizedPnLPercent']:+.1f}%)")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return state
 
@@ -422,5 +652,8 @@ if __name__ == "__main__":
         state = load_state()
         report = generate_daily_report(state)
         print(report)
+    elif len(sys.argv) > 1 and sys.argv[1] == "--dump":
+        # state.json is stored compact; print it indented for inspection
+        print(json.dumps(load_state(), indent=2))
     else:
         run_trading_cycle()
@@ -8,6 +8,7 @@ from .predictor import (
     Prediction,
     PredictionDirection,
     FeatureEngineer,
+    StreamingFeatures,
     LSTMPredictor,
     EnsemblePredictor
 )
@@ -17,6 +18,7 @@ __all__ = [
     'Prediction', 
     'PredictionDirection',
     'FeatureEngineer',
+    'StreamingFeatures',
     'LSTMPredictor',
     'EnsemblePredictor'
 ]
@@ -12,32 +12,47 @@ Features:
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Tuple
 from enum import Enum
 import asyncio
+import importlib.util
 import logging
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 import os
 
 # ML Libraries
-try:
-    import tensorflow as tf
-    from tensorflow.keras.models import Sequential, Model, load_model
+# TensorFlow takes seconds to import, so it is only loaded (by _import_tf)
+# once an LSTM is actually built or used
+TF_AVAILABLE = importlib.util.find_spec('tensorflow') is not None
+tf = None
+
+
+def _import_tf():
+    """Import TensorFlow and the Keras names used by LSTMPredictor, once"""
+    global tf, Model, LSTM, Dense, Dropout, Input, LayerNormalization, MultiHeadAttention
+    global Adam, EarlyStopping, ModelCheckpoint
+    if tf is not None:
+        return
+    
+    import tensorflow
+    from tensorflow.keras.models import Model
     from tensorflow.keras.layers import (
-        LSTM, Dense, Dropout, Input, Attention,
-        LayerNormalization, MultiHeadAttention, GlobalAveragePooling1D
+        LSTM, Dense, Dropout, Input,
+        LayerNormalization, MultiHeadAttention
     )
     from tensorflow.keras.optimizers import Adam
     from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-    TF_AVAILABLE = True
-except ImportError:
-    TF_AVAILABLE = False
+    tf = tensorflow
 
 try:
     from sklearn.preprocessing import MinMaxScaler, StandardScaler
-    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+    from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
     from sklearn.metrics import mean_absolute_error, mean_squared_error
     SKLEARN_AVAILABLE = True
 except ImportError:
@@ -52,6 +67,77 @@ except ImportError:
 logger = logging.getLogger("kit.ai-predictor")
 
 
+# =============================================================================
+# Rolling-window kernels
+# =============================================================================
+# Plain NumPy replacements for pd.Series.rolling(window).mean/std/max/min.
+# Same semantics as pandas with the default min_periods: a window is NaN
+# until it holds `window` values, and any NaN inside it makes it NaN.
+# Means and stds are running-sum differences, so each is one linear pass.
+
+def _window_sums(x: np.ndarray, window: int):
+    """
+    Per trailing window: sum and sum of squares of x - offset, and whether
+    the window is NaN-free. offset (the mean of x) keeps the running sum of
+    squares well conditioned at price levels.
+    """
+    valid = ~np.isnan(x)
+    offset = x[valid].mean() if valid.any() else 0.0
+    xc = np.where(valid, x - offset, 0.0)
+    c1 = np.concatenate(([0.0], np.cumsum(xc)))
+    c2 = np.concatenate(([0.0], np.cumsum(xc * xc)))
+    cv = np.concatenate(([0], np.cumsum(valid)))
+    full = (cv[window:] - cv[:-window]) == window
+    return c1[window:] - c1[:-window], c2[window:] - c2[:-window], full, offset
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        s1, _, full, offset = _window_sums(x, window)
+        out[window - 1:] = np.where(full, s1 / window + offset, np.nan)
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation (ddof=1), like pandas"""
+    out = np.full(len(x), np.nan)
+    if len(x) >= window > 1:
+        s1, s2, full, _ = _window_sums(x, window)
+        var = np.maximum((s2 - s1 * s1 / window) / (window - 1), 0.0)
+        out[window - 1:] = np.where(full, np.sqrt(var), np.nan)
+    return out
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).max(axis=1)
+    return out
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).min(axis=1)
+    return out
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """x lagged by `periods` rows, NaN-padded at the start"""
+    out = np.full(len(x), np.nan)
+    out[periods:] = x[:len(x) - periods]
+    return out
+
+
+def wilder_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing: an EMA with alpha = 1/period (pandas adjust=False),
+    NaN until `period` values have been seen
+    """
+    return pd.Series(x).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().to_numpy()
+
+
 class PredictionDirection(Enum):
     UP = "UP"
     DOWN = "DOWN"
@@ -98,131 +184,511 @@ class FeatureEngineer:
     50+ technical indicators + custom features
     """
     
+    # Output columns, in order; time features only with a DatetimeIndex
+    FEATURE_COLUMNS = [
+        'returns', 'log_returns', 'high_low_ratio', 'close_open_ratio',
+        *[f'{name}_{p}' if name != 'price_sma' else f'price_sma_{p}_ratio'
+          for p in (7, 14, 21, 50, 100, 200) for name in ('sma', 'ema', 'price_sma')],
+        'rsi_7', 'rsi_14', 'rsi_21',
+        'macd', 'macd_signal', 'macd_histogram',
+        *[f'bb_{name}_{p}' for p in (20, 50) for name in ('upper', 'lower', 'width', 'position')],
+        'atr_14', 'atr_14_pct', 'atr_21', 'atr_21_pct',
+        'volume_sma_20', 'volume_ratio', 'volume_change',
+        'obv', 'obv_sma',
+        'momentum_5', 'momentum_10', 'momentum_20',
+        'stoch_k_14', 'stoch_d_14', 'stoch_k_21', 'stoch_d_21',
+        'williams_r', 'cci', 'adx', 'volatility_20', 'volatility_50',
+        'higher_high', 'lower_low', 'inside_bar',
+        'body_size', 'upper_wick_ratio', 'lower_wick_ratio', 'doji',
+    ]
+    TIME_COLUMNS = ['hour', 'day_of_week', 'is_weekend']
+    
     def __init__(self):
         self.feature_names = []
     
     def calculate_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all features from OHLCV data"""
-        features = pd.DataFrame(index=df.index)
+        has_time = isinstance(df.index, pd.DatetimeIndex)
+        columns = self.FEATURE_COLUMNS + (self.TIME_COLUMNS if has_time else [])
+        col_idx = {name: i for i, name in enumerate(columns)}
+        
+        # Every feature is written once into a preallocated column-major
+        # float32 block; float32 halves the memory traffic of everything
+        # downstream (scalers, tree models, LSTM)
+        arr = np.empty((len(df), len(columns)), dtype=np.float32, order='F')
+        
+        def put(name, data):
+            arr[:, col_idx[name]] = data
+        
+        # Raw columns as float64 arrays; intermediates stay float64
+        close = df['close'].to_numpy(dtype=np.float64)
+        open_ = df['open'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        prev_close = shift(close)
+        
+        # Rolling statistics shared by several indicators, computed once each
+        close_sma = {p: rolling_mean(close, p) for p in (7, 14, 20, 21, 50, 100, 200)}
+        close_std = {p: rolling_std(close, p) for p in (20, 50)}
+        high_max = {p: rolling_max(high, p) for p in (14, 21)}
+        low_min = {p: rolling_min(low, p) for p in (14, 21)}
+        close_ema = {s: df['close'].ewm(span=s).mean().to_numpy() for s in (7, 12, 14, 21, 26, 50, 100, 200)}
+        
+        # Zero denominators give inf/NaN, which are dropped below
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Price features
+            returns = close / prev_close - 1
+            put('returns', returns)
+            put('log_returns', np.log(close / prev_close))
+            put('high_low_ratio', high / low)
+            put('close_open_ratio', close / open_)
+            
+            # Moving Averages
+            for period in [7, 14, 21, 50, 100, 200]:
+                put(f'sma_{period}', close_sma[period])
+                put(f'ema_{period}', close_ema[period])
+                put(f'price_sma_{period}_ratio', close / close_sma[period])
+            
+            # RSI
+            delta = close - prev_close
+            for period in [7, 14, 21]:
+                gain = rolling_mean(np.where(delta > 0, delta, 0), period)
+                loss = rolling_mean(np.where(delta < 0, -delta, 0), period)
+                rs = gain / loss
+                put(f'rsi_{period}', 100 - (100 / (1 + rs)))
+            
+            # MACD
+            macd = close_ema[12] - close_ema[26]
+            macd_signal = pd.Series(macd).ewm(span=9).mean().to_numpy()
+            put('macd', macd)
+            put('macd_signal', macd_signal)
+            put('macd_histogram', macd - macd_signal)
+            
+            # Bollinger Bands
+            for period in [20, 50]:
+                sma = close_sma[period]
+                std = close_std[period]
+                bb_upper = sma + (std * 2)
+                bb_lower = sma - (std * 2)
+                put(f'bb_upper_{period}', bb_upper)
+                put(f'bb_lower_{period}', bb_lower)
+                put(f'bb_width_{period}', (bb_upper - bb_lower) / sma)
+                put(f'bb_position_{period}', (close - bb_lower) / (bb_upper - bb_lower))
+            
+            # ATR (Average True Range) - the true range is shared with ADX below.
+            # fmax skips the missing previous close on the first bar, like pandas' max
+            tr = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+            atr = {}
+            for period in [14, 21]:
+                atr[period] = rolling_mean(tr, period)
+                put(f'atr_{period}', atr[period])
+                put(f'atr_{period}_pct', atr[period] / close)
+            
+            # Volume features
+            volume_sma = rolling_mean(volume, 20)
+            put('volume_sma_20', volume_sma)
+            put('volume_ratio', volume / volume_sma)
+            put('volume_change', volume / shift(volume) - 1)
+            
+            # OBV (On-Balance Volume); the first bar has no direction.
+            # Built in place in one output array, without temporaries
+            obv = np.empty_like(close)
+            obv[0] = np.nan
+            np.sign(delta[1:], out=obv[1:])
+            np.multiply(obv[1:], volume[1:], out=obv[1:])
+            np.cumsum(obv[1:], out=obv[1:])
+            put('obv', obv)
+            put('obv_sma', rolling_mean(obv, 20))
+            
+            # Momentum
+            for period in [5, 10, 20]:
+                put(f'momentum_{period}', close / shift(close, period) - 1)
+            
+            # Stochastic
+            for period in [14, 21]:
+                stoch_k = 100 * (close - low_min[period]) / (high_max[period] - low_min[period])
+                put(f'stoch_k_{period}', stoch_k)
+                put(f'stoch_d_{period}', rolling_mean(stoch_k, 3))
+            
+            # Williams %R
+            put('williams_r', -100 * (high_max[14] - close) / (high_max[14] - low_min[14]))
+            
+            # CCI (Commodity Channel Index)
+            tp = (high + low + close) / 3
+            put('cci', (tp - rolling_mean(tp, 20)) / (0.015 * rolling_std(tp, 20)))
+            
+            # ADX (Average Directional Index), per Wilder: only the larger of
+            # the up and down moves counts as directional movement, and DM and
+            # TR are Wilder-smoothed
+            up_move = high - shift(high)
+            down_move = shift(low) - low
+            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+            plus_dm[:1] = minus_dm[:1] = np.nan  # no previous bar
+            
+            tr_smooth = wilder_mean(tr, 14)
+            plus_di = 100 * wilder_mean(plus_dm, 14) / tr_smooth
+            minus_di = 100 * wilder_mean(minus_dm, 14) / tr_smooth
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            put('adx', rolling_mean(dx, 14))
+            
+            # Volatility
+            put('volatility_20', rolling_std(returns, 20) * np.sqrt(365 * 24))
+            put('volatility_50', rolling_std(returns, 50) * np.sqrt(365 * 24))
+            
+            # Price patterns
+            prev_high = shift(high)
+            prev_low = shift(low)
+            put('higher_high', high > prev_high)
+            put('lower_low', low < prev_low)
+            put('inside_bar', (high < prev_high) & (low > prev_low))
+            
+            # Candle patterns
+            body = np.abs(close - open_)
+            wick_upper = high - np.fmax(close, open_)
+            wick_lower = np.fmin(close, open_) - low
+            put('body_size', body / close)
+            put('upper_wick_ratio', wick_upper / (body + 0.0001))
+            put('lower_wick_ratio', wick_lower / (body + 0.0001))
+            put('doji', body / (high - low + 0.0001) < 0.1)
+        
+        # Time features (if datetime index)
+        if has_time:
+            put('hour', df.index.hour)
+            put('day_of_week', df.index.dayofweek)
+            put('is_weekend', df.index.dayofweek >= 5)
+        
+        self.feature_names = columns
+        
+        # Rows with NaN (warm-up) or inf (out-of-range values) are dropped,
+        # using one validity mask over the block
+        valid = np.isfinite(arr).all(axis=1)
+        return pd.DataFrame(arr[valid], index=df.index[valid], columns=columns)
+
+
+# =============================================================================
+# Streaming features
+# =============================================================================
+# Per-indicator state for advancing the FeatureEngineer columns one bar at a
+# time. Every update is O(1) (amortized for the rolling extremes) and follows
+# the batch warm-up rules: a window is NaN until full and while it holds a NaN.
+
+def _ratio(a: float, b: float) -> float:
+    """a / b with NumPy's inf/NaN results instead of ZeroDivisionError"""
+    if b:
+        return a / b
+    if a != a or a == 0:
+        return math.nan
+    return math.copysign(math.inf, a)
+
+
+class RollingState:
+    """Trailing window with running sums: mean and sample std (ddof=1)"""
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.buf = [math.nan] * window
+        self.pos = 0
+        self.n_nan = window  # unfilled slots count as NaN
+        self.offset = None  # first value seen; sums are kept centered on it
+        self.s1 = 0.0
+        self.s2 = 0.0
+    
+    def update(self, x: float) -> 'RollingState':
+        old = self.buf[self.pos]
+        if old != old:
+            self.n_nan -= 1
+        else:
+            d = old - self.offset
+            self.s1 -= d
+            self.s2 -= d * d
+        
+        if x != x:
+            self.n_nan += 1
+        else:
+            if self.offset is None:
+                self.offset = x
+            d = x - self.offset
+            self.s1 += d
+            self.s2 += d * d
+        
+        self.buf[self.pos] = x
+        self.pos = (self.pos + 1) % self.window
+        if self.pos == 0 and self.offset is not None:
+            # Exact re-sum once per lap keeps the running sums from drifting
+            centered = [v - self.offset for v in self.buf if v == v]
+            self.s1 = sum(centered)
+            self.s2 = sum(d * d for d in centered)
+        return self
+    
+    def mean(self) -> float:
+        if self.n_nan:
+            return math.nan
+        return self.s1 / self.window + self.offset
+    
+    def std(self) -> float:
+        if self.n_nan or self.window < 2:
+            return math.nan
+        var = (self.s2 - self.s1 * self.s1 / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class EMAState:
+    """Exponential moving average, pandas ewm(span=...) with adjust=True"""
+    
+    def __init__(self, span: int):
+        self.decay = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+    
+    def update(self, x: float) -> float:
+        self.num = x + self.decay * self.num
+        self.den = 1 + self.decay * self.den
+        return self.num / self.den
+
+
+class WilderState:
+    """Wilder's smoothing (alpha = 1/period), NaN until `period` values"""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 1 / period
+        self.value = math.nan
+        self.count = 0
+    
+    def update(self, x: float) -> float:
+        if x == x:
+            self.value = x if self.count == 0 else self.value + self.alpha * (x - self.value)
+            self.count += 1
+        return self.value if self.count >= self.period else math.nan
+
+
+class ExtremeState:
+    """Rolling max (or min) over a monotonic deque of (bar, value)"""
+    
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.deque = deque()
+        self.count = 0
+        self.last_nan = -window  # bar of the most recent NaN
+    
+    def update(self, x: float) -> float:
+        i = self.count
+        self.count += 1
+        if x != x:
+            self.last_nan = i
+        else:
+            dq = self.deque
+            if self.maximum:
+                while dq and dq[-1][1] <= x:
+                    dq.pop()
+            else:
+                while dq and dq[-1][1] >= x:
+                    dq.pop()
+            dq.append((i, x))
+        
+        while self.deque and self.deque[0][0] <= i - self.window:
+            self.deque.popleft()
+        if self.count < self.window or self.last_nan > i - self.window:
+            return math.nan
+        return self.deque[0][1]
+
+
+class StreamingFeatures:
+    """
+    Incremental counterpart of FeatureEngineer: update() takes one OHLCV bar
+    and returns its feature vector (same columns, same order). The last
+    `history` vectors are kept in a preallocated float32 ring buffer, so the
+    feature frame is available without recomputing any indicator.
+    """
+    
+    def __init__(self, history: int = 500, with_time: bool = True):
+        self.columns = FeatureEngineer.FEATURE_COLUMNS + (FeatureEngineer.TIME_COLUMNS if with_time else [])
+        self.with_time = with_time
+        self.history = history
+        self.buffer = np.full((history, len(self.columns)), np.nan, dtype=np.float32)
+        self.timestamps = [None] * history
+        self.n_bars = 0
+        self.last_timestamp = None
+        
+        self.sma = {p: RollingState(p) for p in (7, 14, 20, 21, 50, 100, 200)}
+        self.ema = {s: EMAState(s) for s in (7, 12, 14, 21, 26, 50, 100, 200)}
+        self.macd_signal = EMAState(9)
+        self.gain = {p: RollingState(p) for p in (7, 14, 21)}
+        self.loss = {p: RollingState(p) for p in (7, 14, 21)}
+        self.tr = {p: RollingState(p) for p in (14, 21)}
+        self.volume = RollingState(20)
+        self.obv = math.nan
+        self.obv_sma = RollingState(20)
+        self.closes = deque(maxlen=21)  # current close and the 20 before it
+        self.high_max = {p: ExtremeState(p, maximum=True) for p in (14, 21)}
+        self.low_min = {p: ExtremeState(p, maximum=False) for p in (14, 21)}
+        self.stoch_d = {p: RollingState(3) for p in (14, 21)}
+        self.tp = RollingState(20)
+        self.tr_smooth = WilderState(14)
+        self.plus_dm = WilderState(14)
+        self.minus_dm = WilderState(14)
+        self.adx = RollingState(14)
+        self.returns = {p: RollingState(p) for p in (20, 50)}
+        self.prev = None  # previous bar as (high, low, close, volume)
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, history: Optional[int] = None) -> 'StreamingFeatures':
+        """Warm up a stream by replaying every bar of an OHLCV frame"""
+        stream = cls(history=history or len(df), with_time=isinstance(df.index, pd.DatetimeIndex))
+        cols = [df[c].to_numpy(dtype=np.float64).tolist() for c in ('open', 'high', 'low', 'close', 'volume')]
+        for timestamp, *bar in zip(df.index, *cols):
+            stream.update(timestamp, *bar)
+        return stream
+    
+    def update(self, timestamp, open_: float, high: float, low: float, close: float, volume: float) -> np.ndarray:
+        """Advance every indicator by one bar and return its feature vector"""
+        open_, high, low, close, volume = float(open_), float(high), float(low), float(close), float(volume)
+        if self.prev is None:
+            prev_high = prev_low = prev_close = prev_volume = math.nan
+        else:
+            prev_high, prev_low, prev_close, prev_volume = self.prev
+        self.prev = (high, low, close, volume)
+        self.closes.append(close)
+        v = {}
         
         # Price features
-        features['returns'] = df['close'].pct_change()
-        features['log_returns'] = np.log(df['close'] / df['close'].shift(1))
-        features['high_low_ratio'] = df['high'] / df['low']
-        features['close_open_ratio'] = df['close'] / df['open']
+        change = _ratio(close, prev_close)
+        returns = change - 1
+        v['returns'] = returns
+        v['log_returns'] = math.log(change) if change > 0 else (-math.inf if change == 0 else math.nan)
+        v['high_low_ratio'] = _ratio(high, low)
+        v['close_open_ratio'] = _ratio(close, open_)
         
         # Moving Averages
-        for period in [7, 14, 21, 50, 100, 200]:
-            features[f'sma_{period}'] = df['close'].rolling(period).mean()
-            features[f'ema_{period}'] = df['close'].ewm(span=period).mean()
-            features[f'price_sma_{period}_ratio'] = df['close'] / features[f'sma_{period}']
+        sma = {p: state.update(close).mean() for p, state in self.sma.items()}
+        ema = {s: state.update(close) for s, state in self.ema.items()}
+        for period in (7, 14, 21, 50, 100, 200):
+            v[f'sma_{period}'] = sma[period]
+            v[f'ema_{period}'] = ema[period]
+            v[f'price_sma_{period}_ratio'] = _ratio(close, sma[period])
         
         # RSI
-        for period in [7, 14, 21]:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            features[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+        delta = close - prev_close
+        for period in (7, 14, 21):
+            gain = self.gain[period].update(delta if delta > 0 else 0.0).mean()
+            loss = self.loss[period].update(-delta if delta < 0 else 0.0).mean()
+            v[f'rsi_{period}'] = 100 - _ratio(100, 1 + _ratio(gain, loss))
         
         # MACD
-        exp1 = df['close'].ewm(span=12).mean()
-        exp2 = df['close'].ewm(span=26).mean()
-        features['macd'] = exp1 - exp2
-        features['macd_signal'] = features['macd'].ewm(span=9).mean()
-        features['macd_histogram'] = features['macd'] - features['macd_signal']
+        macd = ema[12] - ema[26]
+        macd_signal = self.macd_signal.update(macd)
+        v['macd'] = macd
+        v['macd_signal'] = macd_signal
+        v['macd_histogram'] = macd - macd_signal
         
         # Bollinger Bands
-        for period in [20, 50]:
-            sma = df['close'].rolling(period).mean()
-            std = df['close'].rolling(period).std()
-            features[f'bb_upper_{period}'] = sma + (std * 2)
-            features[f'bb_lower_{period}'] = sma - (std * 2)
-            features[f'bb_width_{period}'] = (features[f'bb_upper_{period}'] - features[f'bb_lower_{period}']) / sma
-            features[f'bb_position_{period}'] = (df['close'] - features[f'bb_lower_{period}']) / (features[f'bb_upper_{period}'] - features[f'bb_lower_{period}'])
-        
-        # ATR (Average True Range)
-        for period in [14, 21]:
-            high_low = df['high'] - df['low']
-            high_close = abs(df['high'] - df['close'].shift())
-            low_close = abs(df['low'] - df['close'].shift())
-            tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            features[f'atr_{period}'] = tr.rolling(period).mean()
-            features[f'atr_{period}_pct'] = features[f'atr_{period}'] / df['close']
+        for period in (20, 50):
+            std = self.sma[period].std()
+            bb_upper = sma[period] + std * 2
+            bb_lower = sma[period] - std * 2
+            v[f'bb_upper_{period}'] = bb_upper
+            v[f'bb_lower_{period}'] = bb_lower
+            v[f'bb_width_{period}'] = _ratio(bb_upper - bb_lower, sma[period])
+            v[f'bb_position_{period}'] = _ratio(close - bb_lower, bb_upper - bb_lower)
+        
+        # ATR - the true range skips the missing previous close on the first bar
+        tr = high - low if prev_close != prev_close else max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr = {p: state.update(tr).mean() for p, state in self.tr.items()}
+        for period in (14, 21):
+            v[f'atr_{period}'] = atr[period]
+            v[f'atr_{period}_pct'] = _ratio(atr[period], close)
         
         # Volume features
-        features['volume_sma_20'] = df['volume'].rolling(20).mean()
-        features['volume_ratio'] = df['volume'] / features['volume_sma_20']
-        features['volume_change'] = df['volume'].pct_change()
-        
-        # OBV (On-Balance Volume)
-        obv = (np.sign(df['close'].diff()) * df['volume']).cumsum()
-        features['obv'] = obv
-        features['obv_sma'] = obv.rolling(20).mean()
+        volume_sma = self.volume.update(volume).mean()
+        v['volume_sma_20'] = volume_sma
+        v['volume_ratio'] = _ratio(volume, volume_sma)
+        v['volume_change'] = _ratio(volume, prev_volume) - 1
+        
+        # OBV; the first bar has no direction
+        if delta == delta:
+            direction = (delta > 0) - (delta < 0)
+            self.obv = direction * volume if self.obv != self.obv else self.obv + direction * volume
+        v['obv'] = self.obv
+        v['obv_sma'] = self.obv_sma.update(self.obv).mean()
         
         # Momentum
-        for period in [5, 10, 20]:
-            features[f'momentum_{period}'] = df['close'] / df['close'].shift(period) - 1
+        for period in (5, 10, 20):
+            v[f'momentum_{period}'] = _ratio(close, self.closes[-1 - period]) - 1 if len(self.closes) > period else math.nan
         
         # Stochastic
-        for period in [14, 21]:
-            low_min = df['low'].rolling(period).min()
-            high_max = df['high'].rolling(period).max()
-            features[f'stoch_k_{period}'] = 100 * (df['close'] - low_min) / (high_max - low_min)
-            features[f'stoch_d_{period}'] = features[f'stoch_k_{period}'].rolling(3).mean()
+        high_max = {p: state.update(high) for p, state in self.high_max.items()}
+        low_min = {p: state.update(low) for p, state in self.low_min.items()}
+        for period in (14, 21):
+            stoch_k = _ratio(100 * (close - low_min[period]), high_max[period] - low_min[period])
+            v[f'stoch_k_{period}'] = stoch_k
+            v[f'stoch_d_{period}'] = self.stoch_d[period].update(stoch_k).mean()
         
         # Williams %R
-        features['williams_r'] = -100 * (df['high'].rolling(14).max() - df['close']) / (df['high'].rolling(14).max() - df['low'].rolling(14).min())
-        
-        # CCI (Commodity Channel Index)
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        features['cci'] = (typical_price - typical_price.rolling(20).mean()) / (0.015 * typical_price.rolling(20).std())
-        
-        # ADX (Average Directional Index)
-        plus_dm = df['high'].diff()
-        minus_dm = df['low'].diff()
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm > 0] = 0
-        
-        tr = pd.concat([
-            df['high'] - df['low'],
-            abs(df['high'] - df['close'].shift()),
-            abs(df['low'] - df['close'].shift())
-        ], axis=1).max(axis=1)
-        
-        atr_14 = tr.rolling(14).mean()
-        plus_di = 100 * (plus_dm.rolling(14).mean() / atr_14)
-        minus_di = 100 * (abs(minus_dm).rolling(14).mean() / atr_14)
-        features['adx'] = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-        features['adx'] = features['adx'].rolling(14).mean()
+        v['williams_r'] = _ratio(-100 * (high_max[14] - close), high_max[14] - low_min[14])
+        
+        # CCI
+        tp = (high + low + close) / 3
+        self.tp.update(tp)
+        v['cci'] = _ratio(tp - self.tp.mean(), 0.015 * self.tp.std())
+        
+        # ADX (Wilder)
+        up_move = high - prev_high
+        down_move = prev_low - low
+        if up_move != up_move:
+            plus_dm = minus_dm = math.nan
+        else:
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        tr_smooth = self.tr_smooth.update(tr)
+        plus_di = 100 * _ratio(self.plus_dm.update(plus_dm), tr_smooth)
+        minus_di = 100 * _ratio(self.minus_dm.update(minus_dm), tr_smooth)
+        v['adx'] = self.adx.update(_ratio(100 * abs(plus_di - minus_di), plus_di + minus_di)).mean()
         
         # Volatility
-        features['volatility_20'] = features['returns'].rolling(20).std() * np.sqrt(365 * 24)
-        features['volatility_50'] = features['returns'].rolling(50).std() * np.sqrt(365 * 24)
+        for period in (20, 50):
+            v[f'volatility_{period}'] = self.returns[period].update(returns).std() * math.sqrt(365 * 24)
         
         # Price patterns
-        features['higher_high'] = (df['high'] > df['high'].shift(1)).astype(int)
-        features['lower_low'] = (df['low'] < df['low'].shift(1)).astype(int)
-        features['inside_bar'] = ((df['high'] < df['high'].shift(1)) & (df['low'] > df['low'].shift(1))).astype(int)
+        v['higher_high'] = float(high > prev_high)
+        v['lower_low'] = float(low < prev_low)
+        v['inside_bar'] = float(high < prev_high and low > prev_low)
         
         # Candle patterns
-        body = abs(df['close'] - df['open'])
-        wick_upper = df['high'] - df[['close', 'open']].max(axis=1)
-        wick_lower = df[['close', 'open']].min(axis=1) - df['low']
-        features['body_size'] = body / df['close']
-        features['upper_wick_ratio'] = wick_upper / (body + 0.0001)
-        features['lower_wick_ratio'] = wick_lower / (body + 0.0001)
-        features['doji'] = (body / (df['high'] - df['low'] + 0.0001) < 0.1).astype(int)
-        
-        # Time features (if datetime index)
-        if isinstance(df.index, pd.DatetimeIndex):
-            features['hour'] = df.index.hour
-            features['day_of_week'] = df.index.dayofweek
-            features['is_weekend'] = (df.index.dayofweek >= 5).astype(int)
-        
-        self.feature_names = list(features.columns)
-        
-        return features.replace([np.inf, -np.inf], np.nan).dropna()
+        body = abs(close - open_)
+        v['body_size'] = _ratio(body, close)
+        v['upper_wick_ratio'] = _ratio(high - max(close, open_), body + 0.0001)
+        v['lower_wick_ratio'] = _ratio(min(close, open_) - low, body + 0.0001)
+        v['doji'] = float(_ratio(body, high - low + 0.0001) < 0.1)
+        
+        # Time features
+        if self.with_time:
+            v['hour'] = timestamp.hour
+            v['day_of_week'] = timestamp.dayofweek
+            v['is_weekend'] = float(timestamp.dayofweek >= 5)
+        
+        row = np.array([v[name] for name in self.columns])
+        slot = self.n_bars % self.history
+        self.buffer[slot] = row
+        self.timestamps[slot] = timestamp
+        self.n_bars += 1
+        self.last_timestamp = timestamp
+        
+        return row
+    
+    def frame(self) -> pd.DataFrame:
+        """The buffered feature rows in time order, filtered like FeatureEngineer"""
+        n = min(self.n_bars, self.history)
+        order = (np.arange(n) + self.n_bars - n) % self.history
+        rows = self.buffer[order]
+        keep = np.isfinite(rows).all(axis=1)
+        return pd.DataFrame(
+            rows[keep],
+            index=pd.Index([self.timestamps[i] for i in order[keep]]),
+            columns=self.columns
+        )
 
 
 class LSTMPredictor:
@@ -235,48 +701,61 @@ class LSTMPredictor:
         lookback: int = 168,
         units: List[int] = [128, 64, 32],
         dropout: float = 0.2,
-        learning_rate: float = 0.001
+        learning_rate: float = 0.001,
+        jit_compile: bool = False
     ):
         self.lookback = lookback
         self.units = units
         self.dropout = dropout
         self.learning_rate = learning_rate
+        self.jit_compile = jit_compile  # XLA for the MC Dropout forward pass (opt-in)
         self.model = None
         self.scaler_X = MinMaxScaler()
         self.scaler_y = MinMaxScaler()
         self.is_trained = False
+        self.mc_passes = 50  # Monte Carlo Dropout samples per prediction
+        self._predict_fn = None
+        self._mc_in = None  # reusable device buffer for the MC Dropout batch
         
-    def build_model(self, n_features: int) -> Model:
+    def build_model(self, n_features: int) -> 'Model':
         """Build LSTM model with attention"""
         if not TF_AVAILABLE:
             raise ImportError("TensorFlow required for LSTM model")
+        _import_tf()
+        
+        # float16 compute with float32 weights where a GPU can use it. The
+        # policy is passed to this model's layers rather than set globally,
+        # so other Keras models in the process keep their own dtypes
+        dtype = None
+        if tf.config.list_physical_devices('GPU'):
+            dtype = tf.keras.mixed_precision.Policy('mixed_float16')
         
         inputs = Input(shape=(self.lookback, n_features))
         
         # First LSTM layer
-        x = LSTM(self.units[0], return_sequences=True)(inputs)
-        x = LayerNormalization()(x)
-        x = Dropout(self.dropout)(x)
+        x = LSTM(self.units[0], return_sequences=True, dtype=dtype)(inputs)
+        x = LayerNormalization(dtype=dtype)(x)
+        x = Dropout(self.dropout, dtype=dtype)(x)
         
         # Attention layer
-        attention = MultiHeadAttention(num_heads=4, key_dim=32)(x, x)
+        attention = MultiHeadAttention(num_heads=4, key_dim=32, dtype=dtype)(x, x)
         x = x + attention  # Residual connection
-        x = LayerNormalization()(x)
+        x = LayerNormalization(dtype=dtype)(x)
         
         # Second LSTM layer
-        x = LSTM(self.units[1], return_sequences=True)(x)
-        x = Dropout(self.dropout)(x)
+        x = LSTM(self.units[1], return_sequences=True, dtype=dtype)(x)
+        x = Dropout(self.dropout, dtype=dtype)(x)
         
         # Third LSTM layer
-        x = LSTM(self.units[2], return_sequences=False)(x)
-        x = Dropout(self.dropout)(x)
+        x = LSTM(self.units[2], return_sequences=False, dtype=dtype)(x)
+        x = Dropout(self.dropout, dtype=dtype)(x)
         
         # Dense layers
-        x = Dense(32, activation='relu')(x)
-        x = Dropout(self.dropout)(x)
+        x = Dense(32, activation='relu', dtype=dtype)(x)
+        x = Dropout(self.dropout, dtype=dtype)(x)
         
         # Output: price prediction + uncertainty
-        price_output = Dense(1, name='price')(x)
+        price_output = Dense(1, name='price', dtype='float32')(x)  # float32 output under mixed precision
         
         model = Model(inputs=inputs, outputs=price_output)
         model.compile(
@@ -287,19 +766,46 @@ class LSTMPredictor:
         
         return model
     
+    def _compile_predict_fn(self, n_features: int):
+        """
+        Forward pass with dropout active, traced once for a fixed
+        (batch, lookback, n_features) input signature; XLA-compiled if
+        jit_compile is set
+        """
+        self._predict_fn = tf.function(
+            lambda x: self.model(x, training=True),
+            jit_compile=self.jit_compile,
+            input_signature=[tf.TensorSpec(shape=(None, self.lookback, n_features), dtype=tf.float32)]
+        )
+    
+    def _mc_forward(self, x) -> np.ndarray:
+        """Run the compiled forward pass, dropping back from XLA if it cannot compile"""
+        try:
+            return self._predict_fn(x).numpy()
+        except tf.errors.OpError as e:
+            if not self.jit_compile:
+                raise
+            # Not every layer is XLA-compilable (e.g. the cuDNN LSTM kernel
+            # on GPU): keep the plain traced graph from now on
+            logger.warning(f"XLA compilation of the LSTM failed, running without jit_compile: {e}")
+            self.jit_compile = False
+            self._compile_predict_fn(x.shape[-1])
+            return self._predict_fn(x).numpy()
+    
     def prepare_sequences(
         self,
         features: np.ndarray,
         targets: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
-        """Create sequences for LSTM training"""
-        X, y = [], []
-        
-        for i in range(self.lookback, len(features)):
-            X.append(features[i-self.lookback:i])
-            y.append(targets[i])
+        """
+        Create sequences for LSTM training: X[j] is the lookback window that
+        ends just before targets[lookback + j]. X is a strided view over
+        features, not a copy.
+        """
+        X = sliding_window_view(features, self.lookback, axis=0).swapaxes(1, 2)[:-1]
+        y = targets[self.lookback:]
         
-        return np.array(X), np.array(y)
+        return X, y
     
     def train(
         self,
@@ -311,14 +817,16 @@ class LSTMPredictor:
     ) -> dict:
         """Train the LSTM model"""
         # Scale features
-        X_scaled = self.scaler_X.fit_transform(features.values)
-        y_scaled = self.scaler_y.fit_transform(targets.values.reshape(-1, 1))
+        X_scaled = self.scaler_X.fit_transform(features.values).astype(np.float32)
+        y_scaled = self.scaler_y.fit_transform(targets.values.reshape(-1, 1)).astype(np.float32)
         
         # Create sequences
         X, y = self.prepare_sequences(X_scaled, y_scaled)
         
         # Build model
         self.model = self.build_model(features.shape[1])
+        self._compile_predict_fn(features.shape[1])
+        self._mc_in = None
         
         # Callbacks
         callbacks = [
@@ -344,28 +852,45 @@ class LSTMPredictor:
             'epochs_trained': len(history.history['loss'])
         }
     
-    def predict(self, features: pd.DataFrame) -> Tuple[float, float]:
-        """Make prediction with uncertainty estimation using MC Dropout"""
+    def predict_many(self, features: List[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        MC Dropout predictions for several feature frames (e.g. one per
+        symbol). The latest lookback window of every frame is stacked and all
+        N * mc_passes samples go through the network in one forward call.
+        """
         if not self.is_trained:
             raise ValueError("Model not trained yet")
+        _import_tf()
         
-        X_scaled = self.scaler_X.transform(features.values)
-        X_seq = X_scaled[-self.lookback:].reshape(1, self.lookback, -1)
+        # Only the last window is needed; MinMax scaling is row-wise
+        X_seq = np.stack([
+            self.scaler_X.transform(f.values[-self.lookback:]) for f in features
+        ]).astype(np.float32)
         
-        # Monte Carlo Dropout for uncertainty
-        predictions = []
-        for _ in range(50):  # 50 forward passes
-            pred = self.model(X_seq, training=True)  # Keep dropout active
-            predictions.append(pred.numpy()[0, 0])
+        # Monte Carlo Dropout for uncertainty: dropout samples an independent
+        # mask for every row of the batch
+        X_batch = np.repeat(X_seq, self.mc_passes, axis=0)
+        
+        # The input goes into a persistent variable: same-shape calls reuse
+        # its device memory instead of allocating a new tensor each time
+        if self._mc_in is None or self._mc_in.shape[0] != len(X_batch):
+            self._mc_in = tf.Variable(X_batch, trainable=False)
+        else:
+            self._mc_in.assign(X_batch)
+        predictions = self._mc_forward(self._mc_in).reshape(len(X_seq), self.mc_passes)
         
-        predictions = np.array(predictions)
-        mean_pred = self.scaler_y.inverse_transform([[predictions.mean()]])[0, 0]
-        std_pred = predictions.std()
+        mean_pred = self.scaler_y.inverse_transform(predictions.mean(axis=1).reshape(-1, 1)).ravel()
+        std_pred = predictions.std(axis=1)
         
         # Confidence based on uncertainty
-        confidence = max(0, 1 - (std_pred * 2))  # Lower std = higher confidence
+        confidence = np.maximum(0, 1 - (std_pred * 2))  # Lower std = higher confidence
         
         return mean_pred, confidence
+    
+    def predict(self, features: pd.DataFrame) -> Tuple[float, float]:
+        """Make prediction with uncertainty estimation using MC Dropout"""
+        mean_pred, confidence = self.predict_many([features])
+        return float(mean_pred[0]), float(confidence[0])
 
 
 class EnsemblePredictor:
@@ -373,23 +898,34 @@ class EnsemblePredictor:
     Ensemble of multiple models for robust predictions
     """
     
+    # Constructor parameter holding a model's tree / boosting round count
+    SIZE_PARAMS = {'gradient_boosting': 'max_iter'}
+    
     def __init__(self):
         self.models = {}
         self.weights = {}
+        self.n_estimators = {}  # trees / boosting rounds of a full fit
+        self.trained_at = None
+        self.refreshes = 0  # warm-start refreshes since the last full fit
         
     def add_xgboost(self):
         """Add XGBoost regressor"""
         if not XGB_AVAILABLE:
             return
         
+        # Histogram trees on 64 quantile bins: the sklearn wrapper bins the
+        # training matrix once (QuantileDMatrix) and reuses it every round
         self.models['xgboost'] = xgb.XGBRegressor(
             n_estimators=100,
             max_depth=6,
             learning_rate=0.1,
+            tree_method='hist',
+            max_bin=64,
             objective='reg:squarederror',
             verbosity=0
         )
         self.weights['xgboost'] = 0.3
+        self.n_estimators['xgboost'] = 100
     
     def add_random_forest(self):
         """Add Random Forest regressor"""
@@ -402,45 +938,88 @@ class EnsemblePredictor:
             n_jobs=-1
         )
         self.weights['random_forest'] = 0.2
+        self.n_estimators['random_forest'] = 100
     
     def add_gradient_boosting(self):
-        """Add Gradient Boosting regressor"""
+        """Add (histogram-based) Gradient Boosting regressor"""
         if not SKLEARN_AVAILABLE:
             return
         
-        self.models['gradient_boosting'] = GradientBoostingRegressor(
-            n_estimators=100,
+        self.models['gradient_boosting'] = HistGradientBoostingRegressor(
+            max_iter=100,
             max_depth=5,
-            learning_rate=0.1
+            learning_rate=0.1,
+            early_stopping=False
         )
         self.weights['gradient_boosting'] = 0.2
+        self.n_estimators['gradient_boosting'] = 100
     
     def train(self, X: np.ndarray, y: np.ndarray):
-        """Train all ensemble models"""
+        """Train all ensemble models from scratch"""
         for name, model in self.models.items():
             logger.info(f"Training {name}...")
+            size = {self.SIZE_PARAMS.get(name, 'n_estimators'): self.n_estimators[name]}
+            if name == 'xgboost':
+                model.set_params(**size)
+            else:
+                model.set_params(warm_start=False, **size)
             model.fit(X, y)
-    
-    def predict(self, X: np.ndarray) -> Tuple[float, float]:
-        """Weighted ensemble prediction"""
-        predictions = []
-        total_weight = 0
         
+        self.trained_at = datetime.now()
+        self.refreshes = 0
+    
+    def refresh(self, X: np.ndarray, y: np.ndarray, extra_estimators: int = 20):
+        """
+        Continue training on new data instead of refitting: the sklearn
+        forests add trees via warm_start, XGBoost boosts more rounds on top
+        of its current booster
+        """
         for name, model in self.models.items():
-            pred = model.predict(X.reshape(1, -1))[0]
-            weight = self.weights[name]
-            predictions.append((pred, weight))
-            total_weight += weight
+            logger.info(f"Refreshing {name}...")
+            if name == 'xgboost':
+                booster = model.get_booster()
+                model.set_params(n_estimators=extra_estimators)
+                model.fit(X, y, xgb_model=booster)
+            else:
+                param = self.SIZE_PARAMS.get(name, 'n_estimators')
+                model.set_params(warm_start=True, **{param: model.get_params()[param] + extra_estimators})
+                model.fit(X, y)
+        
+        self.trained_at = datetime.now()
+        self.refreshes += 1
+    
+    def predict_many(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Weighted ensemble prediction for a matrix of feature rows (e.g. the
+        latest row of several symbols). Every model is called once for all
+        rows; inputs go in as float32, which the tree models use internally.
+        """
+        X = np.ascontiguousarray(np.atleast_2d(X), dtype=np.float32)
+        names = list(self.models)
+        weights = np.array([self.weights[name] for name in names])
+        
+        preds = np.empty((len(names), len(X)))
+        for k, name in enumerate(names):
+            model = self.models[name]
+            if name == 'xgboost':
+                # Straight to the booster, skipping the sklearn wrapper and DMatrix
+                preds[k] = model.get_booster().inplace_predict(X)
+            else:
+                preds[k] = model.predict(X)
         
         # Weighted average
-        weighted_pred = sum(p * w for p, w in predictions) / total_weight
+        weighted_pred = weights @ preds / weights.sum()
         
         # Confidence based on agreement between models
-        preds_only = [p for p, _ in predictions]
-        std = np.std(preds_only) if len(preds_only) > 1 else 0
-        confidence = max(0, 1 - (std / (abs(weighted_pred) + 0.0001)))
+        std = preds.std(axis=0) if len(names) > 1 else np.zeros(len(X))
+        confidence = np.maximum(0, 1 - (std / (np.abs(weighted_pred) + 0.0001)))
         
         return weighted_pred, confidence
+    
+    def predict(self, X: np.ndarray) -> Tuple[float, float]:
+        """Weighted ensemble prediction"""
+        weighted_pred, confidence = self.predict_many(X.reshape(1, -1))
+        return float(weighted_pred[0]), float(confidence[0])
 
 
 class MarketPredictor:
@@ -453,15 +1032,22 @@ class MarketPredictor:
         self.config = config or {}
         self.feature_engineer = FeatureEngineer()
         self.lstm = LSTMPredictor()
-        self.ensemble = EnsemblePredictor()
-        
-        # Initialize ensemble models
-        self.ensemble.add_xgboost()
-        self.ensemble.add_random_forest()
-        self.ensemble.add_gradient_boosting()
         
         # Cache for trained models
         self.trained_symbols = {}
+        self.ensembles: Dict[str, EnsemblePredictor] = {}
+        
+        # Ensembles are reused until retrain_interval has passed, then
+        # warm-start refreshed; every max_refreshes-th time they are refit
+        self.retrain_interval = timedelta(hours=self.config.get('retrain_interval_hours', 24))
+        self.max_refreshes = self.config.get('max_refreshes', 5)
+        
+        # Incremental feature state per symbol, and the candles it was built from
+        self._streams: Dict[str, StreamingFeatures] = {}
+        self._candles: Dict[str, pd.DataFrame] = {}
+        
+        # Feature engineering is CPU work; the NumPy kernels release the GIL
+        self._executor = ThreadPoolExecutor(max_workers=self.config.get('feature_workers', os.cpu_count()))
         
     async def fetch_data(
         self,
@@ -479,86 +1065,100 @@ class MarketPredictor:
         
         return pd.DataFrame()
     
-    async def predict(
-        self,
-        symbol: str,
-        timeframe: str = "1h",
-        horizon: int = 24,
-        use_lstm: bool = True,
-        use_ensemble: bool = True
-    ) -> Prediction:
-        """
-        Generate price prediction for a symbol
-        
-        Args:
-            symbol: Trading pair (e.g., "BTC/USDT")
-            timeframe: Candle timeframe
-            horizon: Hours to predict ahead
-            use_lstm: Use LSTM neural network
-            use_ensemble: Use ensemble models
-            
-        Returns:
-            Prediction object with price, direction, confidence
-        """
-        logger.info(f"🔮 Predicting {symbol} {horizon}h ahead...")
-        
-        # Fetch data
+    async def load_data(self, symbol: str, timeframe: str = "1h") -> pd.DataFrame:
+        """Fetch candles, falling back to synthetic demo data"""
         df = await self.fetch_data(symbol, timeframe, limit=500)
         
         if df.empty:
             # Demo mode with synthetic data
             logger.warning("Using demo mode with synthetic data")
-            np.random.seed(42)
+            rng = np.random.default_rng(42)
             n = 500
-            df = pd.DataFrame({
-                'timestamp': pd.date_range(end=datetime.now(), periods=n, freq='1h'),
-                'open': 50000 + np.cumsum(np.random.randn(n) * 100),
-                'high': 0,
-                'low': 0,
-                'close': 0,
-                'volume': np.random.uniform(100, 1000, n)
-            })
-            df['close'] = df['open'] + np.random.randn(n) * 50
-            df['high'] = df[['open', 'close']].max(axis=1) + np.random.uniform(0, 100, n)
-            df['low'] = df[['open', 'close']].min(axis=1) - np.random.uniform(0, 100, n)
-            df.set_index('timestamp', inplace=True)
-        
-        # Feature engineering
-        features = self.feature_engineer.calculate_features(df)
-        current_price = df['close'].iloc[-1]
-        
-        predictions = []
-        confidences = []
+            z = rng.standard_normal((n, 2))
+            u = rng.uniform(0, 100, (n, 2))
+            volume = rng.uniform(100, 1000, n)
+            
+            open_ = 50000 + np.cumsum(z[:, 0] * 100)
+            close = open_ + z[:, 1] * 50
+            high = np.maximum(open_, close) + u[:, 0]
+            low = np.minimum(open_, close) - u[:, 1]
+            
+            df = pd.DataFrame(
+                np.asfortranarray(np.column_stack([open_, high, low, close, volume])),
+                index=pd.date_range(end=datetime.now(), periods=n, freq='1h', name='timestamp'),
+                columns=['open', 'high', 'low', 'close', 'volume']
+            )
         
-        # LSTM prediction
-        if use_lstm and TF_AVAILABLE:
-            try:
-                if symbol not in self.trained_symbols:
-                    # Train on historical data
-                    targets = df['close'].iloc[len(df) - len(features):]
-                    self.lstm.train(features, targets, epochs=50)
-                    self.trained_symbols[symbol] = True
-                
-                lstm_pred, lstm_conf = self.lstm.predict(features)
-                predictions.append(lstm_pred)
-                confidences.append(lstm_conf)
-                logger.info(f"LSTM: ${lstm_pred:.2f} (conf: {lstm_conf:.1%})")
-            except Exception as e:
-                logger.error(f"LSTM prediction failed: {e}")
+        return df
+    
+    def _features(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features for a symbol's candles. When the candles are the previous
+        call's plus one new closed bar, the symbol's StreamingFeatures state
+        is advanced by that bar instead of recomputing every indicator.
+        """
+        previous = self._candles.get(symbol)
+        self._candles[symbol] = df
         
-        # Ensemble prediction
-        if use_ensemble and SKLEARN_AVAILABLE:
-            try:
-                X = features.values
-                y = df['close'].iloc[len(df) - len(features):].values
-                self.ensemble.train(X[:-horizon], y[:-horizon])
-                
-                ens_pred, ens_conf = self.ensemble.predict(X[-1])
-                predictions.append(ens_pred)
-                confidences.append(ens_conf)
-                logger.info(f"Ensemble: ${ens_pred:.2f} (conf: {ens_conf:.1%})")
-            except Exception as e:
-                logger.error(f"Ensemble prediction failed: {e}")
+        if previous is not None and len(df) > 1 and isinstance(df.index, pd.DatetimeIndex):
+            stream = self._streams.get(symbol)
+            if df.index[-1] == previous.index[-1] and stream is not None and df.iloc[-1].equals(previous.iloc[-1]):
+                return stream.frame()
+            
+            # The bar before the new one must be unchanged (not a revised live candle)
+            if df.index[-2] == previous.index[-1] and df.iloc[-2].equals(previous.iloc[-1]):
+                if stream is None:
+                    stream = self._streams[symbol] = StreamingFeatures.from_frame(previous)
+                bar = df.iloc[-1]
+                stream.update(df.index[-1], bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'])
+                self.feature_engineer.feature_names = stream.columns
+                return stream.frame()
+        
+        # First call, or candles that don't continue the previous ones
+        self._streams.pop(symbol, None)
+        return self.feature_engineer.calculate_features(df)
+    
+    def _train_lstm(self, symbol: str, df: pd.DataFrame, features: pd.DataFrame):
+        """Train the LSTM on a symbol's history the first time it is seen"""
+        if symbol not in self.trained_symbols:
+            targets = df['close'].reindex(features.index)
+            self.lstm.train(features, targets, epochs=50)
+            self.trained_symbols[symbol] = True
+    
+    def _ensemble_predict(self, symbol: str, df: pd.DataFrame, features: pd.DataFrame, horizon: int) -> Tuple[float, float]:
+        """
+        Predict a symbol's latest row with its own ensemble, training it
+        first if it is new or older than retrain_interval
+        """
+        X = features.values
+        ensemble = self.ensembles.get(symbol)
+        if ensemble is None:
+            ensemble = self.ensembles[symbol] = EnsemblePredictor()
+            ensemble.add_xgboost()
+            ensemble.add_random_forest()
+            ensemble.add_gradient_boosting()
+        
+        if ensemble.trained_at is None or datetime.now() - ensemble.trained_at >= self.retrain_interval:
+            y = df['close'].reindex(features.index).values
+            if ensemble.trained_at is None or ensemble.refreshes >= self.max_refreshes:
+                ensemble.train(X[:-horizon], y[:-horizon])
+            else:
+                ensemble.refresh(X[:-horizon], y[:-horizon])
+        
+        return ensemble.predict(X[-1])
+    
+    def _build_prediction(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        predictions: List[float],
+        confidences: List[float],
+        horizon: int,
+        use_lstm: bool,
+        use_ensemble: bool
+    ) -> Prediction:
+        """Combine model outputs into a Prediction"""
+        current_price = df['close'].iloc[-1]
         
         # Combine predictions
         if predictions:
@@ -602,18 +1202,117 @@ class MarketPredictor:
         
         return prediction
     
+    async def predict(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        horizon: int = 24,
+        use_lstm: bool = True,
+        use_ensemble: bool = True
+    ) -> Prediction:
+        """
+        Generate price prediction for a symbol
+        
+        Args:
+            symbol: Trading pair (e.g., "BTC/USDT")
+            timeframe: Candle timeframe
+            horizon: Hours to predict ahead
+            use_lstm: Use LSTM neural network
+            use_ensemble: Use ensemble models
+            
+        Returns:
+            Prediction object with price, direction, confidence
+        """
+        logger.info(f"🔮 Predicting {symbol} {horizon}h ahead...")
+        
+        # Fetch data
+        df = await self.load_data(symbol, timeframe)
+        
+        # Feature engineering
+        features = self._features(symbol, df)
+        
+        predictions = []
+        confidences = []
+        
+        # LSTM prediction
+        if use_lstm and TF_AVAILABLE:
+            try:
+                self._train_lstm(symbol, df, features)
+                lstm_pred, lstm_conf = self.lstm.predict(features)
+                predictions.append(lstm_pred)
+                confidences.append(lstm_conf)
+                logger.info(f"LSTM: ${lstm_pred:.2f} (conf: {lstm_conf:.1%})")
+            except Exception as e:
+                logger.error(f"LSTM prediction failed: {e}")
+        
+        # Ensemble prediction
+        if use_ensemble and SKLEARN_AVAILABLE:
+            try:
+                ens_pred, ens_conf = self._ensemble_predict(symbol, df, features, horizon)
+                predictions.append(ens_pred)
+                confidences.append(ens_conf)
+                logger.info(f"Ensemble: ${ens_pred:.2f} (conf: {ens_conf:.1%})")
+            except Exception as e:
+                logger.error(f"Ensemble prediction failed: {e}")
+        
+        return self._build_prediction(symbol, df, predictions, confidences, horizon, use_lstm, use_ensemble)
+    
     async def predict_batch(
         self,
         symbols: List[str],
         timeframe: str = "1h",
-        horizon: int = 24
+        horizon: int = 24,
+        use_lstm: bool = True,
+        use_ensemble: bool = True
     ) -> List[Prediction]:
-        """Predict multiple symbols in parallel"""
-        tasks = [
-            self.predict(symbol, timeframe, horizon)
-            for symbol in symbols
+        """
+        Predict multiple symbols together: candles are fetched concurrently,
+        features are computed in parallel threads and the LSTM runs a single
+        forward pass over all symbols' windows
+        """
+        logger.info(f"🔮 Predicting {len(symbols)} symbols {horizon}h ahead...")
+        
+        frames = await asyncio.gather(*[self.load_data(symbol, timeframe) for symbol in symbols])
+        
+        # Features for all symbols in parallel on the thread pool
+        loop = asyncio.get_running_loop()
+        features = await asyncio.gather(*[
+            loop.run_in_executor(self._executor, self._features, symbol, df)
+            for symbol, df in zip(symbols, frames)
+        ])
+        
+        predictions = [[] for _ in symbols]
+        confidences = [[] for _ in symbols]
+        
+        # LSTM prediction, one batched call for every symbol
+        if use_lstm and TF_AVAILABLE:
+            try:
+                for symbol, df, feats in zip(symbols, frames, features):
+                    self._train_lstm(symbol, df, feats)
+                
+                lstm_preds, lstm_confs = self.lstm.predict_many(features)
+                for i, symbol in enumerate(symbols):
+                    predictions[i].append(lstm_preds[i])
+                    confidences[i].append(lstm_confs[i])
+                    logger.info(f"LSTM {symbol}: ${lstm_preds[i]:.2f} (conf: {lstm_confs[i]:.1%})")
+            except Exception as e:
+                logger.error(f"LSTM prediction failed: {e}")
+        
+        # Ensemble prediction (each symbol has its own ensemble)
+        if use_ensemble and SKLEARN_AVAILABLE:
+            for i, symbol in enumerate(symbols):
+                try:
+                    ens_pred, ens_conf = self._ensemble_predict(symbol, frames[i], features[i], horizon)
+                    predictions[i].append(ens_pred)
+                    confidences[i].append(ens_conf)
+                    logger.info(f"Ensemble {symbol}: ${ens_pred:.2f} (conf: {ens_conf:.1%})")
+                except Exception as e:
+                    logger.error(f"Ensemble prediction failed for {symbol}: {e}")
+        
+        return [
+            self._build_prediction(symbol, frames[i], predictions[i], confidences[i], horizon, use_lstm, use_ensemble)
+            for i, symbol in enumerate(symbols)
         ]
-        return await asyncio.gather(*tasks)
     
     def get_top_predictions(
         self,
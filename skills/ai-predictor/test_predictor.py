@@ -6,41 +6,64 @@ Works without TensorFlow using sklearn only
 import sys
 import os
 
-# Fix Windows encoding
-if sys.platform == 'win32':
-    sys.stdout.reconfigure(encoding='utf-8')
-
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import contextlib
+import io
 import json
+from scipy.signal import lfilter
+from joblib import Memory
+
+# Only imports and definitions live at module level: on Windows every
+# worker process re-imports this file, so the checks and output are in main()
 
 # Test sklearn availability
 try:
-    from sklearn.preprocessing import MinMaxScaler
     from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-    print("[OK] scikit-learn available")
+    SKLEARN_AVAILABLE = True
 except ImportError:
-    print("[ERROR] scikit-learn not installed!")
-    sys.exit(1)
+    SKLEARN_AVAILABLE = False
 
 # Test xgboost
 try:
     import xgboost as xgb
-    print("[OK] XGBoost available")
     XGB_AVAILABLE = True
 except ImportError:
-    print("[WARN] XGBoost not available, using sklearn only")
     XGB_AVAILABLE = False
 
-print("\n" + "="*60)
-print("K.I.T. AI Market Predictor - Live Test")
-print("="*60)
+# Opt-in disk cache for trained ensembles: set KIT_PREDICTOR_CACHE to a
+# directory (no location = joblib caching disabled, nothing written)
+CACHE_DIR = os.environ.get('KIT_PREDICTOR_CACHE')
+
+# The symbols are predicted in parallel worker processes; each one's
+# model fits get a share of the cores
+SYMBOL_WORKERS = 3
+N_JOBS = max(1, (os.cpu_count() or 1) // SYMBOL_WORKERS)
+
+# Ensemble hyperparameters. Together with ENSEMBLE_VERSION they are part of
+# the cache key, so bump the version whenever SimpleEnsemblePredictor changes
+ENSEMBLE_VERSION = 2
+ENSEMBLE_PARAMS = {
+    'rf': {'n_estimators': 30, 'max_depth': 8},
+    'gb': {'n_estimators': 50, 'max_depth': 4, 'learning_rate': 0.1},
+}
+if XGB_AVAILABLE:
+    ENSEMBLE_PARAMS['xgb'] = {'n_estimators': 50, 'max_depth': 5, 'learning_rate': 0.1,
+                              'tree_method': 'hist', 'max_bin': 64}
+
+# Optional: bottleneck for C moving-window kernels
+try:
+    import bottleneck as bn
+    BN_AVAILABLE = True
+except ImportError:
+    BN_AVAILABLE = False
 
 # Generate synthetic market data
 def generate_market_data(symbol: str, n: int = 500):
     """Generate realistic-looking price data"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Start price based on symbol
     if "BTC" in symbol:
@@ -56,100 +79,178 @@ def generate_market_data(symbol: str, n: int = 500):
         base_price = 100
         volatility = 2
     
+    # All random draws in two batched calls: normals for returns and open
+    # jitter, uniforms for the high/low wicks and volume
+    noise = rng.standard_normal((2, n))
+    u = rng.uniform(0.0, 1.0, size=(3, n))
+    
     # Random walk with trend
-    returns = np.random.randn(n) * 0.02 + 0.0001  # Slight upward bias
+    returns = noise[0] * 0.02 + 0.0001  # Slight upward bias
     prices = base_price * np.cumprod(1 + returns)
     
+    open_arr = prices + noise[1] * volatility * 0.1
+    close_arr = prices
+    volume = 1000 + 9000 * u[2]
+    
     df = pd.DataFrame({
         'timestamp': pd.date_range(end=datetime.now(), periods=n, freq='1h'),
-        'open': prices + np.random.randn(n) * volatility * 0.1,
-        'close': prices,
-        'volume': np.random.uniform(1000, 10000, n)
+        'open': open_arr,
+        'close': close_arr,
+        'volume': volume
     })
-    df['high'] = df[['open', 'close']].max(axis=1) + np.random.uniform(0, volatility, n)
-    df['low'] = df[['open', 'close']].min(axis=1) - np.random.uniform(0, volatility, n)
+    df['high'] = np.maximum(open_arr, close_arr) + u[0] * volatility
+    df['low'] = np.minimum(open_arr, close_arr) - u[1] * volatility
     df.set_index('timestamp', inplace=True)
     
     return df
 
+# Moving-window helpers
+def move_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing moving average over an ndarray, NaN until the window is full"""
+    if BN_AVAILABLE:
+        return bn.move_mean(x, window, min_count=window)
+    
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        csum = np.cumsum(np.concatenate(([0.0], x)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+def move_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation (ddof=1), NaN until the window is full"""
+    if BN_AVAILABLE:
+        return bn.move_std(x, window, min_count=window, ddof=1)
+    
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window).std(axis=1, ddof=1)
+    return out
+
+def lag(x: np.ndarray, periods: int) -> np.ndarray:
+    """x shifted forward by periods, NaN-filled at the start"""
+    out = np.full(len(x), np.nan)
+    out[periods:] = x[:-periods]
+    return out
+
+def ewm_mean(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    Same values as pd.Series(x).ewm(span=span).mean() for NaN-free input:
+    the adjusted EMA is the ratio of two first-order IIR filters (weighted
+    sum over weight total), both run in C by lfilter
+    """
+    decay = 1 - 2 / (span + 1)
+    a = [1.0, -decay]
+    return lfilter([1.0], a, x) / lfilter([1.0], a, np.ones_like(x))
+
 # Feature engineering
 def calculate_features(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate technical indicators"""
-    features = pd.DataFrame(index=df.index)
+    # Every indicator is computed as an ndarray into cols; the DataFrame is
+    # assembled once at the end
+    close_arr = df['close'].to_numpy(dtype=np.float64)
+    volume_arr = df['volume'].to_numpy(dtype=np.float64)
+    cols = {}
     
-    # Returns
-    features['returns'] = df['close'].pct_change()
-    features['log_returns'] = np.log(df['close'] / df['close'].shift(1))
+    # Each rolling/EWM pass over close is done once and shared below
+    rolling_means = {p: move_mean(close_arr, p) for p in (7, 14, 20, 21, 50)}
+    rolling_stds = {20: move_std(close_arr, 20)}
+    emas = {s: ewm_mean(close_arr, s) for s in (7, 14, 21, 50, 12, 26)}
+    
+    # Returns - the one-bar difference is taken once and reused (also by RSI)
+    prev = lag(close_arr, 1)
+    delta = close_arr - prev
+    cols['returns'] = delta / prev
+    cols['log_returns'] = np.log1p(cols['returns'])
     
     # Moving averages
     for period in [7, 14, 21, 50]:
-        features[f'sma_{period}'] = df['close'].rolling(period).mean()
-        features[f'ema_{period}'] = df['close'].ewm(span=period).mean()
-        features[f'price_sma_{period}_ratio'] = df['close'] / features[f'sma_{period}']
+        sma = rolling_means[period]
+        cols[f'sma_{period}'] = sma
+        cols[f'ema_{period}'] = emas[period]
+        cols[f'price_sma_{period}_ratio'] = close_arr / sma
     
-    # RSI
+    # RSI - gains and losses are split once from the shared diff
+    gains = np.fmax(delta, 0)  # fmax: first (NaN) diff counts as 0
+    losses = np.fmax(-delta, 0)
     for period in [7, 14]:
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        gain = move_mean(gains, period)
+        loss = move_mean(losses, period)
         rs = gain / (loss + 1e-10)
-        features[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+        cols[f'rsi_{period}'] = 100 - (100 / (1 + rs))
     
     # MACD
-    exp1 = df['close'].ewm(span=12).mean()
-    exp2 = df['close'].ewm(span=26).mean()
-    features['macd'] = exp1 - exp2
-    features['macd_signal'] = features['macd'].ewm(span=9).mean()
+    macd = emas[12] - emas[26]
+    cols['macd'] = macd
+    cols['macd_signal'] = ewm_mean(macd, 9)
     
     # Bollinger Bands position
-    sma20 = df['close'].rolling(20).mean()
-    std20 = df['close'].rolling(20).std()
-    features['bb_upper'] = sma20 + (std20 * 2)
-    features['bb_lower'] = sma20 - (std20 * 2)
-    features['bb_position'] = (df['close'] - features['bb_lower']) / (features['bb_upper'] - features['bb_lower'] + 1e-10)
+    sma20 = rolling_means[20]
+    std20 = rolling_stds[20]
+    cols['bb_upper'] = sma20 + (std20 * 2)
+    cols['bb_lower'] = sma20 - (std20 * 2)
+    cols['bb_position'] = (close_arr - cols['bb_lower']) / (cols['bb_upper'] - cols['bb_lower'] + 1e-10)
     
     # Volatility
-    features['volatility'] = features['returns'].rolling(20).std()
+    cols['volatility'] = move_std(cols['returns'], 20)
     
     # Volume
-    features['volume_sma'] = df['volume'].rolling(20).mean()
-    features['volume_ratio'] = df['volume'] / (features['volume_sma'] + 1e-10)
+    cols['volume_sma'] = move_mean(volume_arr, 20)
+    cols['volume_ratio'] = volume_arr / (cols['volume_sma'] + 1e-10)
     
     # Momentum
     for period in [5, 10, 20]:
-        features[f'momentum_{period}'] = df['close'] / df['close'].shift(period) - 1
+        cols[f'momentum_{period}'] = close_arr / lag(close_arr, period) - 1
     
+    features = pd.DataFrame(cols, index=df.index)
     return features.replace([np.inf, -np.inf], np.nan).dropna()
 
 # Ensemble predictor
 class SimpleEnsemblePredictor:
-    def __init__(self):
+    def __init__(self, params: dict = ENSEMBLE_PARAMS):
+        self.params = params
         self.models = {}
-        self.scaler = MinMaxScaler()
+        # Min-max scaling parameters, set by train()
+        self._mn = None
+        self._rng = None
         
     def train(self, X: np.ndarray, y: np.ndarray):
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        # Scale features; the tree learners bin/split on float32, so the
+        # data is handed over already in that layout
+        self._mn = X.min(axis=0)
+        self._rng = X.max(axis=0) - self._mn
+        self._rng[self._rng == 0] = 1.0  # constant features scale to 0
+        X_scaled = np.ascontiguousarray((X - self._mn) / self._rng, dtype=np.float32)
+        y = np.ascontiguousarray(y, dtype=np.float32)
         
         # Random Forest
-        self.models['rf'] = RandomForestRegressor(n_estimators=50, max_depth=8, n_jobs=-1)
-        self.models['rf'].fit(X_scaled, y)
+        self.models['rf'] = RandomForestRegressor(**self.params['rf'], n_jobs=N_JOBS)
         
         # Gradient Boosting
-        self.models['gb'] = GradientBoostingRegressor(n_estimators=50, max_depth=4, learning_rate=0.1)
-        self.models['gb'].fit(X_scaled, y)
+        self.models['gb'] = GradientBoostingRegressor(**self.params['gb'])
         
         # XGBoost if available
-        if XGB_AVAILABLE:
-            self.models['xgb'] = xgb.XGBRegressor(n_estimators=50, max_depth=5, learning_rate=0.1, verbosity=0)
-            self.models['xgb'].fit(X_scaled, y)
+        if 'xgb' in self.params:
+            self.models['xgb'] = xgb.XGBRegressor(**self.params['xgb'], n_jobs=N_JOBS, verbosity=0)
+        
+        # The models are independent, so they are fitted concurrently
+        # (the tree builders release the GIL)
+        with ThreadPoolExecutor(max_workers=len(self.models)) as pool:
+            fits = [pool.submit(model.fit, X_scaled, y) for model in self.models.values()]
+            for fit in fits:
+                fit.result()
     
     def predict(self, X: np.ndarray):
-        X_scaled = self.scaler.transform(X.reshape(1, -1))
+        X_scaled = ((X.reshape(1, -1) - self._mn) / self._rng).astype(np.float32)
         
         predictions = []
         for name, model in self.models.items():
-            pred = model.predict(X_scaled)[0]
+            if name == 'rf':
+                # For a single row, the forest's joblib dispatch costs far more
+                # than the trees themselves: walk them directly and average
+                # like the forest
+                pred = sum(tree.predict(X_scaled, check_input=False)[0] for tree in model.estimators_) / len(model.estimators_)
+            else:
+                pred = model.predict(X_scaled)[0]
             predictions.append(pred)
         
         mean_pred = np.mean(predictions)
@@ -160,6 +261,15 @@ class SimpleEnsemblePredictor:
         
         return mean_pred, confidence
 
+def train_ensemble(X_train: np.ndarray, y_train: np.ndarray, params: dict, version: int) -> SimpleEnsemblePredictor:
+    """
+    Train an ensemble. With the cache enabled, a run with identical data,
+    hyperparameters and ENSEMBLE_VERSION is loaded from disk instead
+    """
+    ensemble = SimpleEnsemblePredictor(params)
+    ensemble.train(X_train, y_train)
+    return ensemble
+
 # Main prediction function
 def predict_price(symbol: str, horizon: int = 24):
     """Predict price for a symbol"""
@@ -183,8 +293,8 @@ def predict_price(symbol: str, horizon: int = 24):
     
     # Train ensemble
     print("  Training ensemble models...")
-    ensemble = SimpleEnsemblePredictor()
-    ensemble.train(X_train, y_train)
+    train = Memory(CACHE_DIR, verbose=0).cache(train_ensemble)
+    ensemble = train(X_train, y_train, ENSEMBLE_PARAMS, ENSEMBLE_VERSION)
     
     # Predict
     pred_price, confidence = ensemble.predict(X[-1])
@@ -203,7 +313,7 @@ def predict_price(symbol: str, horizon: int = 24):
         direction = "NEUTRAL"
     
     # Prediction range
-    vol = df['close'].pct_change().std() * np.sqrt(horizon)
+    vol = features['returns'].std() * np.sqrt(horizon)
     low = pred_price * (1 - vol * 2)
     high = pred_price * (1 + vol * 2)
     
@@ -226,8 +336,33 @@ def predict_price(symbol: str, horizon: int = 24):
     
     return result
 
+def predict_symbol_job(symbol: str):
+    """Worker-process entry: run predict_price and hand its log back with the result"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = predict_price(symbol, horizon=24)
+    return log.getvalue(), result
+
 # Run tests
-if __name__ == "__main__":
+def main():
+    # Fix Windows encoding
+    if sys.platform == 'win32':
+        sys.stdout.reconfigure(encoding='utf-8')
+    
+    if not SKLEARN_AVAILABLE:
+        print("[ERROR] scikit-learn not installed!")
+        sys.exit(1)
+    print("[OK] scikit-learn available")
+    
+    if XGB_AVAILABLE:
+        print("[OK] XGBoost available")
+    else:
+        print("[WARN] XGBoost not available, using sklearn only")
+    
+    print("\n" + "="*60)
+    print("K.I.T. AI Market Predictor - Live Test")
+    print("="*60)
+    
     print("\n" + "-"*60)
     print("Running predictions...")
     print("-"*60)
@@ -235,9 +370,12 @@ if __name__ == "__main__":
     symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
     results = []
     
-    for symbol in symbols:
-        result = predict_price(symbol, horizon=24)
-        results.append(result)
+    # Per-symbol jobs share nothing, so they run in separate processes;
+    # logs are printed in symbol order once each job is done
+    with ProcessPoolExecutor(max_workers=SYMBOL_WORKERS) as executor:
+        for log, result in executor.map(predict_symbol_job, symbols):
+            print(log, end='')
+            results.append(result)
     
     print("\n" + "="*60)
     print("SUMMARY - 24h Predictions")
@@ -250,3 +388,6 @@ if __name__ == "__main__":
     
     print("\n[SUCCESS] AI Predictor test completed!")
     print(f"Models used: {results[0]['models_used']}")
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,19 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import time
 import ccxt
 
+# ccxt.pro (bundled with recent ccxt) streams tickers over websockets
+try:
+    import ccxt.pro as ccxtpro
+    CCXT_PRO_AVAILABLE = True
+except ImportError:
+    CCXT_PRO_AVAILABLE = False
+
 ALERTS_PATH = os.path.expanduser('~/.kit/alerts.json')
 
 def load_alerts():
@@ -23,8 +31,52 @@ def load_alerts():
 
 def save_alerts(data):
     os.makedirs(os.path.dirname(ALERTS_PATH), exist_ok=True)
-    with open(ALERTS_PATH, 'w') as f:
-        json.dump(data, f, indent=2)
+    # Compact JSON (use --list to read it); temp file + rename, so a reader
+    # (or a crash) never sees a half-written file
+    tmp = ALERTS_PATH + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp, ALERTS_PATH)
+
+def alerts_mtime():
+    try:
+        return os.stat(ALERTS_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+class AlertBook:
+    """
+    alerts.json held in memory while watching: re-read only when the file
+    changes on disk (e.g. --add from another shell), written back at most
+    once per check when alerts triggered
+    """
+    
+    def __init__(self):
+        self.data = {'alerts': []}
+        self.mtime = None
+        self.dirty = False
+        self.refresh()
+    
+    def refresh(self):
+        mtime = alerts_mtime()
+        if mtime != self.mtime:
+            self.data = load_alerts()
+            self.mtime = mtime
+    
+    def flush(self):
+        if not self.dirty:
+            return
+        if alerts_mtime() != self.mtime:
+            # The file changed while we were waiting for prices: merge our
+            # deactivations into it instead of overwriting the new alerts
+            done = {alert['id'] for alert in self.data['alerts'] if not alert['active']}
+            self.data = load_alerts()
+            for alert in self.data['alerts']:
+                if alert['id'] in done:
+                    alert['active'] = False
+        save_alerts(self.data)
+        self.mtime = alerts_mtime()
+        self.dirty = False
 
 def add_alert(symbol, condition, value):
     data = load_alerts()
@@ -48,40 +100,123 @@ def list_alerts():
         if alert['active']:
             print(f"  [{alert['id']}] {alert['symbol']} {alert['condition']} ${alert['value']:,.2f}")
 
-def watch_alerts():
-    data = load_alerts()
-    exchange = ccxt.binance()
-    
-    print("👁️ Watching alerts... (Ctrl+C to stop)")
-    print("=" * 50)
-    
-    while True:
-        for alert in data['alerts']:
-            if not alert['active']:
+def active_symbols(data):
+    # Sorted, so an unchanged alert set always asks for the same subscription
+    return sorted({alert['symbol'] for alert in data['alerts'] if alert['active']})
+
+def known_symbols(symbols, markets, skipped):
+    """
+    Drop symbols the exchange doesn't list (one typo'd alert would otherwise
+    fail the whole batched request), warning once per symbol
+    """
+    known = []
+    for symbol in symbols:
+        if symbol in markets:
+            known.append(symbol)
+        elif symbol not in skipped:
+            skipped.add(symbol)
+            print(f"⚠️ Unknown symbol {symbol} - its alerts are skipped")
+    return known
+
+def check_alerts(data, tickers, expected=()):
+    """
+    Check the active alerts against a {symbol: ticker} dict; True if any
+    triggered. Symbols in expected that got no ticker are reported.
+    """
+    any_triggered = False
+    for alert in data['alerts']:
+        if not alert['active']:
+            continue
+            
+        try:
+            ticker = tickers.get(alert['symbol'])
+            if ticker is None:
+                if alert['symbol'] in expected:
+                    print(f"⚠️ No ticker returned for {alert['symbol']}")
                 continue
+            price = ticker['last']
+            
+            triggered = False
+            if alert['condition'] == 'above' and price >= alert['value']:
+                triggered = True
+            elif alert['condition'] == 'below' and price <= alert['value']:
+                triggered = True
+            
+            if triggered:
+                print(f"\n🚨 ALERT TRIGGERED!")
+                print(f"   {alert['symbol']} is ${price:,.2f}")
+                print(f"   Condition: {alert['condition']} ${alert['value']:,.2f}")
+                alert['active'] = False
+                any_triggered = True
                 
+        except Exception as e:
+            print(f"⚠️ Error checking {alert['symbol']}: {e}")
+    
+    return any_triggered
+
+async def stream_alerts(book):
+    """Push-based: check alerts on every websocket ticker update"""
+    exchange = ccxtpro.binance()
+    skipped = set()
+    try:
+        while True:
+            book.refresh()
+            symbols = active_symbols(book.data)
+            if not symbols:
+                await asyncio.sleep(30)
+                continue
+            
             try:
-                ticker = exchange.fetch_ticker(alert['symbol'])
-                price = ticker['last']
-                
-                triggered = False
-                if alert['condition'] == 'above' and price >= alert['value']:
-                    triggered = True
-                elif alert['condition'] == 'below' and price <= alert['value']:
-                    triggered = True
+                # An unknown symbol would fail the whole subscription
+                await exchange.load_markets()
+                symbols = known_symbols(symbols, exchange.markets, skipped)
+                if not symbols:
+                    await asyncio.sleep(30)
+                    continue
                 
-                if triggered:
-                    print(f"\n🚨 ALERT TRIGGERED!")
-                    print(f"   {alert['symbol']} is ${price:,.2f}")
-                    print(f"   Condition: {alert['condition']} ${alert['value']:,.2f}")
-                    alert['active'] = False
-                    save_alerts(data)
-                    
+                # Resolves with the tickers that changed since the last call
+                tickers = await exchange.watch_tickers(symbols)
+            except Exception as e:
+                print(f"⚠️ Error watching tickers: {e}")
+                await asyncio.sleep(5)
+                continue
+            
+            book.dirty |= check_alerts(book.data, tickers)
+            book.flush()
+    finally:
+        await exchange.close()
+
+def poll_alerts(book):
+    """Polling fallback: one batched ticker request every 30s"""
+    exchange = ccxt.binance()
+    skipped = set()
+    
+    while True:
+        book.refresh()
+        symbols = active_symbols(book.data)
+        if symbols:
+            try:
+                exchange.load_markets()  # fetched once, then cached by ccxt
+                symbols = known_symbols(symbols, exchange.markets, skipped)
+                if symbols:
+                    book.dirty |= check_alerts(book.data, exchange.fetch_tickers(symbols), expected=symbols)
             except Exception as e:
-                print(f"⚠️ Error checking {alert['symbol']}: {e}")
+                print(f"⚠️ Error fetching tickers: {e}")
+            book.flush()
         
         time.sleep(30)
 
+def watch_alerts():
+    book = AlertBook()
+    
+    print("👁️ Watching alerts... (Ctrl+C to stop)")
+    print("=" * 50)
+    
+    if CCXT_PRO_AVAILABLE:
+        asyncio.run(stream_alerts(book))
+    else:
+        poll_alerts(book)
+
 def main():
     parser = argparse.ArgumentParser(description='K.I.T. Alert Monitor')
     parser.add_argument('--add', nargs=3, metavar=('SYMBOL', 'CONDITION', 'VALUE'),
@@ -9,9 +9,10 @@ Handles:
 """
 
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import logging
 
 logger = logging.getLogger("MT5Data")
@@ -52,8 +53,15 @@ class MT5Data:
         tick = data.get_tick("EURUSD")
         candles = data.get_candles("EURUSD", "H1", 100)
         info = data.get_symbol_info("EURUSD")
+        ticks = data.update_ticks("EURUSD")  # incremental tick history
     """
     
+    def __init__(self, max_ticks: int = 1_000_000):
+        # symbol -> {'data': structured tick array, 'n': used rows,
+        #            'last_msc': int, 'last_count': buffered ticks at last_msc}
+        self._tick_buffers: Dict[str, Dict[str, Any]] = {}
+        self.max_ticks = max_ticks  # per-symbol history kept by update_ticks
+    
     def get_tick(self, symbol: str) -> Dict[str, Any]:
         """
         Get current tick data (bid/ask)
@@ -221,6 +229,81 @@ class MT5Data:
         
         return df[['time', 'bid', 'ask', 'last', 'volume']]
     
+    def update_ticks(
+        self,
+        symbol: str,
+        since: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Get tick history, downloading only ticks not yet buffered
+        
+        The first call fetches from `since` (default: one hour ago); later
+        calls request the range from the newest buffered tick on and append
+        it to a per-symbol array that doubles its capacity when full, up to
+        max_ticks; beyond that the oldest ticks are dropped.
+        
+        Args:
+            symbol: Trading symbol
+            since: Start of the history on the first call (UTC)
+            
+        Returns:
+            Structured array of all buffered ticks (a view, oldest first)
+        """
+        if not self._select_symbol(symbol):
+            raise ValueError(f"Symbol {symbol} not available")
+        
+        buf = self._tick_buffers.get(symbol)
+        if buf is None:
+            last_msc, last_count = -1, 0
+            date_from = since or datetime.now(timezone.utc) - timedelta(hours=1)
+        else:
+            last_msc, last_count = buf['last_msc'], buf['last_count']
+            date_from = datetime.fromtimestamp(last_msc / 1000, tz=timezone.utc)
+        
+        ticks = mt5.copy_ticks_range(symbol, date_from, datetime.now(timezone.utc), mt5.COPY_TICKS_ALL)
+        if ticks is None:
+            raise ValueError(f"Failed to get ticks for {symbol}")
+        
+        # date_from has one-second resolution, so drop ticks we already hold.
+        # Several ticks can share a millisecond: the last one is re-requested
+        # and only the ticks already buffered for it are skipped (they come
+        # first, in arrival order)
+        ticks = ticks[ticks['time_msc'] >= last_msc]
+        held = min(last_count, int(np.count_nonzero(ticks['time_msc'] == last_msc)))
+        ticks = ticks[held:]
+        
+        if buf is None:
+            buf = self._tick_buffers[symbol] = {
+                'data': np.empty(min(self.max_ticks, max(1024, 2 * len(ticks))), dtype=ticks.dtype),
+                'n': 0,
+                'last_msc': last_msc,
+                'last_count': last_count,
+            }
+        
+        if len(ticks):
+            new_msc = int(ticks['time_msc'][-1])
+            new_count = int(np.count_nonzero(ticks['time_msc'] == new_msc))
+            buf['last_count'] = buf['last_count'] + new_count if new_msc == buf['last_msc'] else new_count
+            buf['last_msc'] = new_msc
+        
+        ticks = ticks[-self.max_ticks:]
+        n, k = buf['n'], len(ticks)
+        data = buf['data']
+        if n + k > len(data) and len(data) < self.max_ticks:
+            grown = np.empty(min(max(2 * len(data), n + k), self.max_ticks), dtype=data.dtype)
+            grown[:n] = data[:n]
+            data = buf['data'] = grown
+        if n + k > len(data):
+            # At the cap: keep the newest ticks
+            keep = len(data) - k
+            data[:keep] = data[n - keep:n]
+            n = keep
+        if k:
+            data[n:n + k] = ticks
+            buf['n'] = n + k
+        
+        return data[:buf['n']]
+    
     def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
         """
         Get detailed symbol information